@@ -1,2 +1,5 @@
 from .api_client_session import AsyncClientSession
+from .connection_pool import ConnectionPoolConfig
+from .json_codec import JsonCodec, get_codec
+from .namespaced_cache import CacheConfig
 from .models import models_as_jsonschema
@@ -1,21 +1,25 @@
 from collections import defaultdict
 
-from api_client.contextual_prefixed_cache import ContextualCache
+from api_client.connection_pool import ConnectionPoolConfig, ConnectionPoolStats, create_client_session
+from api_client.json_codec import JsonCodec
+from api_client.namespaced_cache import CacheConfig, NamespacedCache
+from api_client.revalidation import RevalidationPolicies
 from api_client.thunder_protection import thunder_protection
 
 import asyncio
-import copy
 import hashlib
 import hmac
-import json
 import logging
 import time
-from typing import Optional, Dict, List, Tuple, Any
+from types import MappingProxyType
+from typing import Optional, Dict, List, Tuple, Any, Union
 
 import yarl
+from aiohttp import ContentTypeError, hdrs
 from jsonapi_client import Filter, Inclusion, Session
 from jsonapi_client.common import HttpStatus, error_from_response, HttpMethod
 from jsonapi_client.document import Document
+from jsonapi_client.filter import Modifier
 
 from jsonapi_client.exceptions import DocumentError
 from api_client.exceptions import NotModifiedError
@@ -24,6 +28,8 @@ from dto import GroupDTO, SubscriptionDTO, TeacherDTO
 
 logger = logging.getLogger(__name__)
 
+CACHED_ETAG = object()  # If-None-Match по ETag закешированного документа
+
 
 class AsyncClientSession(Session):
     def __init__(
@@ -34,6 +40,11 @@ class AsyncClientSession(Session):
         schema: dict = None,
         request_kwargs: dict = None,
         use_relationship_iterator: bool = False,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+        revalidation_policies: Optional[Dict[str, dict]] = None,
+        cache_config: Optional[CacheConfig] = None,
+        lazy_documents: bool = False,
+        json_codec: Optional[JsonCodec] = None,
     ) -> None:
         request_kwargs = request_kwargs or {}
 
@@ -41,21 +52,54 @@ class AsyncClientSession(Session):
         headers = request_kwargs.setdefault("headers", {})
         headers.setdefault("X-Platform", platform)
 
+        # Базовый Session в async-режиме создает aiohttp.ClientSession с настройками по умолчанию.
+        # Инициализируем его в sync-режиме и подключаем собственную сессию с настроенным пулом.
         super().__init__(
             server_url=server_url,
-            enable_async=True,
+            enable_async=False,
             schema=schema,
             request_kwargs=request_kwargs,
             use_relationship_iterator=use_relationship_iterator,
         )
-
-        self.resources_by_resource_identifier = ContextualCache(maxsize=10_000, ttl=600)
-        self.resources_by_link = ContextualCache(maxsize=10_000, ttl=600)
-        self.documents_by_link = ContextualCache(maxsize=10_000, ttl=600)
+        self.enable_async = True
+        self.pool_config = pool_config or ConnectionPoolConfig()
+        self.pool_stats = ConnectionPoolStats()
+        self._aiohttp_session = create_client_session(self.pool_config, self.pool_stats)
+
+        self.cache_config = cache_config or CacheConfig()
+        self.resources_by_resource_identifier = NamespacedCache(self.cache_config)
+        self.resources_by_link = NamespacedCache(self.cache_config)
+        self.documents_by_link = NamespacedCache(self.cache_config)
+        # Ресурсы документов создаются при первом обращении (см. CustomDocument)
+        self.lazy_documents = lazy_documents
+        self.json_codec = json_codec or JsonCodec()
 
         self.hmac_secret = hmac_secret.encode("utf-8") if hmac_secret else None
         self.platform = platform
 
+        self.revalidation_policies = RevalidationPolicies(self.url_prefix, revalidation_policies)
+        self._background_tasks: set[asyncio.Task] = set()
+
+        # Статичная часть запроса (X-Platform и пр.) фиксируется один раз при создании клиента.
+        # Поверх нее каждый запрос собирает собственный словарь заголовков (см. _build_authenticated_request_kwargs)
+        self._static_request_kwargs = MappingProxyType(
+            {k: v for k, v in self._request_kwargs.items() if k != "headers"}
+        )
+        self._static_headers = MappingProxyType(dict(self._request_kwargs.get("headers", {})))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Сбрасывает все закешированные документы и ресурсы пользователя."""
+        for cache in (self.documents_by_link, self.resources_by_link, self.resources_by_resource_identifier):
+            cache.invalidate_user(user_id)
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Объем и счетчики обращений кешей клиента."""
+        return {
+            "documents_by_link": self.documents_by_link.stats_dict(),
+            "resources_by_link": self.resources_by_link.stats_dict(),
+            "resources_by_resource_identifier": self.resources_by_resource_identifier.stats_dict(),
+        }
+
     def _url_for_resource(
         self, resource_type: str, resource_id: str = None, filter: "Modifier" = None
     ) -> str:
@@ -105,14 +149,16 @@ class AsyncClientSession(Session):
             url: str,
             body: Optional[bytes] = None,
     ) -> Dict[str, Any]:
+        """
+        Собирает kwargs запроса: неизменяемый шаблон + заголовки конкретного запроса.
+        Словарь kwargs и словарь заголовков создаются заново на каждый вызов,
+        поэтому X-Social-ID и подпись одного пользователя не могут попасть в запрос другого.
+        """
         ctx = request_context.get({})
         social_id = ctx.get("user_id")
         use_hmac = ctx.get("hmac", False)
 
-        # Пока deepcopy не даёт накладных расходов, используем его
-        # для устойчивости при возможном расширении request_kwargs
-        kwargs = copy.deepcopy(self._request_kwargs)
-        headers = kwargs.setdefault("headers", {})
+        headers = dict(self._static_headers)
 
         if social_id:
             headers["X-Social-ID"] = social_id
@@ -123,31 +169,94 @@ class AsyncClientSession(Session):
         if method in (HttpMethod.POST, HttpMethod.PATCH):
             headers['Content-Type'] = 'application/vnd.api+json'
 
-        return kwargs
+        return {**self._static_request_kwargs, "headers": headers}
 
-    async def fetch_document_by_url_async(self, url: str) -> 'Document':
-        """Fetch a Document from cache or server by URL, with ETag validation for cached document"""
-        if document := self.documents_by_link.get(url):
+    async def fetch_document_by_url_async(self, url: str, revalidate: bool = False) -> 'Document':
+        """
+        Fetch a Document from cache or server by URL, with ETag validation for cached document.
+        Cached documents are served according to stale-while-revalidate policy of the resource type,
+        with revalidate=True the cached document is always validated by the server (If-None-Match).
+        """
+        document = self.documents_by_link.get(url)
+        if document and not revalidate:
             if not document.etag:
                 return document  # Без ETag просто используем кешированный документ
 
+            policy = self.revalidation_policies.resolve(url)
+            if document.age < policy.soft_ttl:
+                return document
+            if document.age < policy.hard_ttl:
+                self._revalidate_in_background(url)
+                return document
+
         try:
             return await self._ext_fetch_by_url_async(url)
         except NotModifiedError:
+            document.touch()
             return document
 
+    def _revalidate_in_background(self, url: str) -> None:
+        task = asyncio.create_task(self._revalidate(url))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _revalidate(self, url: str) -> None:
+        """Фоновая ревалидация документа. Параллельные ревалидации одного URL схлопываются."""
+        try:
+            await self._ext_fetch_by_url_async(url)
+        except NotModifiedError:
+            if document := self.documents_by_link.get(url):
+                document.touch()
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {url}: {e}")
+
     @thunder_protection(prefix="_ext_fetch_by_url_async")
     async def _ext_fetch_by_url_async(self, url: str) -> 'Document':
-        json_data, etag = await self._fetch_json_async(url)
-        print(json_data)
-        return self.read(json_data, url, etag=etag)
+        json_data, etag, payload_size = await self._fetch_json_async(url)
+        return self.read(json_data, url, etag=etag, payload_size=payload_size)
 
-    def read(self, json_data: dict, url='', etag=None, no_cache=False) -> 'Document':
+    def read(self, json_data: dict, url='', etag=None, no_cache=False, payload_size=0) -> 'Document':
         """Read document from json_data dictionary instead of fetching it from the server."""
         from api_client.document import CustomDocument
-        doc = self.documents_by_link[url] = CustomDocument(self, json_data, url, etag=etag, no_cache=no_cache)
+        doc = self.documents_by_link[url] = CustomDocument(
+            self, json_data, url, etag=etag, no_cache=no_cache, payload_size=payload_size,
+            lazy=self.lazy_documents,
+        )
         return doc
 
+    async def get_revalidated(
+            self,
+            resource_type: str,
+            resource_id_or_filter: Union[Modifier, str, None] = None,
+    ) -> 'Document':
+        """
+        Документ, подтвержденный сервером при этом запросе: stale-while-revalidate не применяется,
+        закешированный документ ревалидируется по ETag и при 304 возвращается он же.
+        Для вызывающих с собственным TTL поверх документа (см. LessonWindowCache):
+        иначе их TTL отсчитывался бы от документа, который уже мог быть устаревшим.
+        """
+        resource_id, filter_ = self._resource_type_and_filter(resource_id_or_filter)
+        url = self._url_for_resource(resource_type, resource_id, filter_)
+        return await self.fetch_document_by_url_async(url, revalidate=True)
+
+    async def get_if_modified(
+            self,
+            resource_type: str,
+            resource_id_or_filter: Union[Modifier, str, None] = None,
+            etag: Optional[str] = None,
+    ) -> Optional['Document']:
+        """
+        Запрашивает документ с сервера в обход кеша, с условием If-None-Match: etag.
+        Возвращает None, если документ не изменился (304). Полученный документ кешируется как обычно.
+        """
+        resource_id, filter_ = self._resource_type_and_filter(resource_id_or_filter)
+        url = self._url_for_resource(resource_type, resource_id, filter_)
+        try:
+            json_data, new_etag, payload_size = await self._fetch_json_async(url, etag=etag)
+        except NotModifiedError:
+            return None
+        return self.read(json_data, url, etag=new_etag, payload_size=payload_size)
+
     async def fetch_resource_by_resource_identifier_async(
                 self,
                 resource: 'Union[ResourceIdentifier, ResourceObject, ResourceTuple]',
@@ -169,31 +278,36 @@ class AsyncClientSession(Session):
             # no need to do it manually here
             return (await self._ext_fetch_by_url_async(f"{resource.url}/")).resource
 
-    async def _fetch_json_async(self, url: str) -> Tuple[dict, Optional[str]]:
+    async def _fetch_json_async(self, url: str, etag: Any = CACHED_ETAG) -> Tuple[dict, Optional[str], int]:
         """
         Internal use. Async version.
 
         Fetch document raw json from server using aiohttp library.
+        Returns json, ETag and size of the raw payload in bytes.
+        If-None-Match is taken from the cached document unless etag is given explicitly (None - unconditional).
         """
         self.assert_async()
         logger.info('Fetching document from url %s', url)
 
         request_kwargs = self._build_authenticated_request_kwargs("GET", url)
-        if document := self.documents_by_link.get(url):
-            if document_etag := document.etag:
-                headers = request_kwargs.setdefault("headers", {})
-                headers["If-None-Match"] = document_etag
-        logger.debug("Request headers: %s", **request_kwargs.get("headers", {}))
+        if etag is CACHED_ETAG:
+            document = self.documents_by_link.get(url)
+            etag = document.etag if document else None
+        if etag:
+            request_kwargs["headers"]["If-None-Match"] = etag
+        logger.debug("Request headers: %s", request_kwargs["headers"])
 
         async with self._aiohttp_session.get(url, **request_kwargs) as response:
             if response.status == 304:
                 raise NotModifiedError("Document not modified")
 
-            response_content = await response.json(content_type='application/vnd.api+json')
+            payload = await response.read()
+            # Проверка Content-Type, как в response.json(): HTML-страница прокси - ContentTypeError, а не ошибка разбора
+            response_content = self._decode_response(response, payload, "application/vnd.api+json")
 
             if response.status == HttpStatus.OK_200:
                 new_etag = response.headers.get("ETag")
-                return response_content, new_etag
+                return response_content, new_etag, len(payload)
             else:
                 raise DocumentError(f'Error {response.status}: '
                                     f'{error_from_response(response_content)}',
@@ -216,13 +330,13 @@ class AsyncClientSession(Session):
         content_type = "" if http_method == HttpMethod.DELETE else "application/vnd.api+json"
         url = self.ensure_trailing_slash(url)
 
-        body_bytes = json.dumps(send_json, ensure_ascii=False).encode("utf-8") if send_json else b""
+        body_bytes = self.json_codec.dumps(send_json) if send_json else b""
 
         request_kwargs = self._build_authenticated_request_kwargs(http_method, url, body_bytes)
-        logger.debug("Request headers: %s", **request_kwargs.get("headers", {}))
+        logger.debug("Request headers: %s", request_kwargs["headers"])
 
         async with self._aiohttp_session.request(http_method, url, data=body_bytes, **request_kwargs) as response:
-            response_json = await response.json(content_type=content_type)
+            response_json = self._decode_response(response, await response.read(), content_type)
 
             if response.status not in expected_statuses:
                 raise DocumentError(
@@ -240,7 +354,15 @@ class AsyncClientSession(Session):
                 response.headers.get("Location"),
             )
 
-
-
-
-
+    def _decode_response(self, response, payload: bytes, content_type: str) -> Any:
+        """Как response.json(content_type=...), но bytes разбираются кодеком сессии без промежуточной строки."""
+        if content_type and content_type not in response.headers.get(hdrs.CONTENT_TYPE, "").lower():
+            raise ContentTypeError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"Attempt to decode JSON with unexpected mimetype: {response.headers.get(hdrs.CONTENT_TYPE)}",
+                headers=response.headers,
+            )
+        payload = payload.strip()
+        return self.json_codec.loads(payload) if payload else None
@@ -6,8 +6,48 @@
 
 import sys
 import types
+from typing import Iterator
 
-from .utils import camelize_attribute_name, decamelize_attribute_name
+from pydantic import BaseModel
+
+from .models import models_as_jsonschema
+from .utils import (
+    camelize_attribute_name,
+    decamelize_attribute_name,
+    precompute_attribute_names,
+    schema_attribute_names,
+)
+
+
+def known_attribute_names() -> Iterator[str]:
+    """Поля схемы API-клиента и всех DTO: для них преобразования имен вычисляются заранее."""
+    import dto
+
+    yield from schema_attribute_names(models_as_jsonschema)
+    for model in vars(dto).values():
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            yield from model.__pydantic_fields__
+
+
+def _replace_references(common_mod: types.ModuleType, log) -> int:
+    """Заменяет ссылки на функции сериализации во всех загруженных модулях jsonapi_client."""
+    replaced_count = 0
+    for name, module in list(sys.modules.items()):
+        if not isinstance(module, types.ModuleType):
+            continue
+        if not name.startswith("jsonapi_client"):
+            continue
+
+        # Проверяем и заменяем ссылки, если они указывают на старые функции
+        for func_name in ("jsonify_attribute_name", "dejsonify_attribute_name"):
+            if hasattr(module, func_name):
+                current_func = getattr(module, func_name)
+                new_func = getattr(common_mod, func_name)
+                if current_func is not new_func:
+                    setattr(module, func_name, new_func)
+                    replaced_count += 1
+                    log(f"🔄 Replaced {name}.{func_name}")
+    return replaced_count
 
 
 def patch_jsonapi_client(verbose: bool = True):
@@ -35,22 +75,10 @@ def patch_jsonapi_client(verbose: bool = True):
     common_mod.jsonify_attribute_name = camelize_attribute_name
     common_mod.dejsonify_attribute_name = decamelize_attribute_name
 
-    # 4️⃣ Проверяем все загруженные подмодули библиотеки
-    replaced_count = 0
-    for name, module in list(sys.modules.items()):
-        if not isinstance(module, types.ModuleType):
-            continue
-        if not name.startswith("jsonapi_client"):
-            continue
+    table_size = precompute_attribute_names(known_attribute_names())
+    log(f"Precomputed {table_size} attribute name translations")
 
-        # 5️⃣ Проверяем и заменяем ссылки, если они указывают на старые функции
-        for func_name in ("jsonify_attribute_name", "dejsonify_attribute_name"):
-            if hasattr(module, func_name):
-                current_func = getattr(module, func_name)
-                new_func = getattr(common_mod, func_name)
-                if current_func is not new_func:
-                    setattr(module, func_name, new_func)
-                    replaced_count += 1
-                    log(f"🔄 Replaced {name}.{func_name}")
+    # 4️⃣ Проверяем все загруженные подмодули библиотеки
+    replaced_count = _replace_references(common_mod, log)
 
     log(f"✅ Patch complete. Updated {replaced_count} references.")
@@ -0,0 +1,86 @@
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import aiohttp
+
+
+@dataclass(frozen=True)
+class ConnectionPoolConfig:
+    """Параметры пула соединений aiohttp для API-клиента."""
+    limit: int = 100                # Всего одновременных соединений (0 - без ограничений)
+    limit_per_host: int = 0         # Соединений к одному хосту (0 - без ограничений)
+    keepalive_timeout: float = 15   # Сколько держать простаивающее соединение открытым (сек)
+    dns_cache_ttl: int = 300        # Время жизни DNS-кеша (сек)
+    connect_timeout: float = 5      # Таймаут установки соединения (сек)
+    read_timeout: float = 30        # Таймаут чтения ответа (сек)
+
+
+class ConnectionPoolStats:
+    """
+    Метрики пула соединений, собираемые через aiohttp TraceConfig.
+    Ожидание в очереди пула означает, что все соединения заняты (пул насыщен).
+    """
+
+    def __init__(self):
+        self.queued_now = 0         # Запросов ждут свободное соединение прямо сейчас
+        self.queued_total = 0       # Сколько раз запрос вставал в очередь пула
+        self.wait_time_total = 0.0  # Суммарное время ожидания в очереди (сек)
+        self.wait_time_max = 0.0    # Максимальное время ожидания в очереди (сек)
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "queued_now": self.queued_now,
+            "queued_total": self.queued_total,
+            "wait_time_avg": self.wait_time_total / self.queued_total if self.queued_total else 0.0,
+            "wait_time_max": self.wait_time_max,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+        }
+
+    async def _on_queued_start(self, _session, ctx: SimpleNamespace, _params) -> None:
+        ctx.queued_at = time.monotonic()
+        self.queued_now += 1
+        self.queued_total += 1
+
+    async def _on_queued_end(self, _session, ctx: SimpleNamespace, _params) -> None:
+        waited = time.monotonic() - ctx.queued_at
+        self.queued_now -= 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+    async def _on_connection_create_end(self, _session, _ctx, _params) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, _session, _ctx, _params) -> None:
+        self.connections_reused += 1
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return trace_config
+
+
+def create_client_session(config: ConnectionPoolConfig, stats: ConnectionPoolStats) -> aiohttp.ClientSession:
+    """Создает aiohttp.ClientSession с явно настроенным пулом соединений и таймаутами."""
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=config.connect_timeout,
+        sock_read=config.read_timeout,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[stats.trace_config()],
+    )
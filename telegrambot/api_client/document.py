@@ -1,4 +1,75 @@
+import time
+from collections.abc import MutableMapping, Sequence
+from typing import Iterator, Optional
+
 from jsonapi_client.document import Document
+from jsonapi_client.resourceobject import ResourceObject
+
+from context import request_context
+
+
+class LazyResources(Sequence):
+    """
+    Ресурсы документа в ленивом режиме: исходные JSON-объекты,
+    которые превращаются в ResourceObject при первом обращении.
+    """
+
+    def __init__(self, document: "CustomDocument", raw: list[dict]):
+        self._document = document
+        self.raw = raw
+        self._objects: list[Optional[ResourceObject]] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.raw)))]
+        resource = self._objects[index]
+        if resource is None:
+            resource = self._objects[index] = self._document._materialize(self.raw[index])
+        return resource
+
+    def __iter__(self) -> Iterator[ResourceObject]:
+        for index in range(len(self.raw)):
+            yield self[index]
+
+    def materialized(self) -> Iterator[ResourceObject]:
+        """Уже созданные ResourceObject."""
+        return (resource for resource in self._objects if resource is not None)
+
+
+class IncludedResources(MutableMapping):
+    """
+    Ресурсы секции included одного типа по id.
+    В ленивом режиме ResourceObject создается только для запрошенного id.
+    """
+
+    def __init__(self, included: Sequence, positions: dict[str, int]):
+        self._included = included
+        self._positions = positions
+        self._extra: dict[str, ResourceObject] = {}  # Ресурсы, догруженные отдельными запросами
+
+    def __getitem__(self, resource_id: str) -> ResourceObject:
+        if resource_id in self._extra:
+            return self._extra[resource_id]
+        return self._included[self._positions[resource_id]]
+
+    def __setitem__(self, resource_id: str, resource: ResourceObject) -> None:
+        self._extra[resource_id] = resource
+
+    def __delitem__(self, resource_id: str) -> None:
+        raise TypeError("Included resources of a document are read-only")
+
+    def __contains__(self, resource_id) -> bool:
+        return resource_id in self._extra or resource_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._positions
+        yield from (resource_id for resource_id in self._extra if resource_id not in self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions) + sum(1 for resource_id in self._extra if resource_id not in self._positions)
 
 
 class CustomDocument(Document):
@@ -9,10 +80,115 @@ class CustomDocument(Document):
         url: str,
         etag: str = None,
         no_cache: bool = False,
+        payload_size: int = 0,
+        lazy: bool = False,
     ) -> None:
+        # Размер исходного JSON для бюджета кешей сессии (см. NamespacedCache)
+        self._cache_size = payload_size
+        self._lazy = lazy
+        # Исходный JSON для быстрых декодеров репозиториев (см. repositories.json_decoding).
+        # Хранится только в ленивом режиме: там те же объекты уже держит LazyResources и они учтены
+        # в _cache_size один раз, а обычный документ держал бы их вторично рядом с ResourceObject
+        self.json_data = json_data if lazy else None
         super().__init__(session, json_data, url, no_cache)
         self._etag = etag
+        self._fetched_at = time.monotonic()
+
+    def _handle_data(self, json_data):
+        if self._lazy:
+            self._handle_data_lazy(json_data)
+            return
+
+        # Ресурсы кешируются здесь, а не в базовом классе: до попадания в кеш им нужен размер
+        no_cache, self._no_cache = self._no_cache, True
+        super()._handle_data(json_data)
+        self._no_cache = no_cache
+
+        resources = [*self.resources, *self.included]
+        if not resources:
+            return
+        # Размер документа делится поровну между его ресурсами
+        resource_size = max(self._cache_size // len(resources), 1)
+        for resource in resources:
+            resource._cache_size = resource_size
+        if not no_cache:
+            self.session.add_resources(*resources)
+
+    def _handle_data_lazy(self, json_data):
+        """
+        Ленивый режим: ресурсы остаются исходными JSON-объектами до первого обращения.
+        ResourceObject создается и попадает в кеши сессии только для ресурсов, которые реально читаются.
+        """
+        data = json_data.get("data")
+        included = json_data.get("included", [])
+
+        # Проверки и служебные секции (errors, meta, links) - как в базовом классе, но без ресурсов
+        super()._handle_data({**json_data, "data": [] if data else data, "included": []})
+
+        raw = data if isinstance(data, list) else [data] if data else []
+        self.resources = LazyResources(self, raw)
+        self.included = LazyResources(self, included)
+
+        resource_count = len(raw) + len(included)
+        self._resource_size = max(self._cache_size // resource_count, 1) if resource_count else 1
+        # Пространство кеша выбирается по контексту запроса, а обращение к ресурсу может быть позже
+        self._request_context = request_context.get()
+        self._included_positions: Optional[dict[str, dict[str, int]]] = None
+
+    def _materialize(self, raw: dict) -> ResourceObject:
+        resource = ResourceObject(self.session, raw)
+        resource._cache_size = self._resource_size
+        if not self._no_cache:
+            token = request_context.set(self._request_context)
+            try:
+                self.session.add_resources(resource)
+            finally:
+                request_context.reset(token)
+        return resource
+
+    @property
+    def lazy(self) -> bool:
+        return self._lazy
+
+    def included_by_type(self) -> dict[str, MutableMapping[str, ResourceObject]]:
+        """
+        Ресурсы секции included по типу и id.
+        В ленивом режиме индекс строится по исходному JSON, ResourceObject создаются по запросу.
+        """
+        if not self._lazy:
+            grouped: dict[str, dict[str, ResourceObject]] = {}
+            for resource in self.included:
+                grouped.setdefault(resource.type, {})[resource.id] = resource
+            return grouped
+
+        if self._included_positions is None:
+            positions: dict[str, dict[str, int]] = {}
+            for position, raw in enumerate(self.included.raw):
+                positions.setdefault(raw["type"], {})[str(raw["id"])] = position
+            self._included_positions = positions
+        return {
+            resource_type: IncludedResources(self.included, ids)
+            for resource_type, ids in self._included_positions.items()
+        }
+
+    def mark_invalid(self):
+        if not self._lazy:
+            super().mark_invalid()
+            return
+        # Еще не созданные ресурсы некому помечать: они не попадали в кеши сессии
+        super(Document, self).mark_invalid()
+        for resource in self.resources.materialized():
+            resource.mark_invalid()
 
     @property
     def etag(self) -> str:
         return self._etag
+
+    @property
+    def age(self) -> float:
+        """Сколько секунд прошло с загрузки или последней успешной ревалидации документа."""
+        return time.monotonic() - self._fetched_at
+
+    def touch(self) -> None:
+        """Отмечает документ как подтвержденный сервером (ответ 304 Not Modified)."""
+        self._fetched_at = time.monotonic()
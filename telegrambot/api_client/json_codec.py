@@ -0,0 +1,68 @@
+"""
+Кодеки JSON API-клиента: тело ответа разбирается из bytes за один проход,
+тело запроса сразу кодируется в bytes (UTF-8, как требует JSON:API).
+
+По умолчанию используется стандартный json. Более быстрые orjson и msgspec
+подключаются настройкой api_json_codec, если пакет установлен.
+"""
+import json
+from typing import Any, Callable
+
+
+class JsonCodec:
+    """Стандартный json."""
+    name = "json"
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.loads = orjson.loads
+        self.dumps = orjson.dumps
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self.loads = msgspec.json.Decoder().decode
+        self.dumps = msgspec.json.Encoder().encode
+
+
+CODECS: dict[str, Callable[[], JsonCodec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+}
+
+
+def get_codec(name: str = JsonCodec.name) -> JsonCodec:
+    """
+    Кодек по имени: json, orjson, msgspec или auto - самый быстрый из установленных.
+    Явно выбранный, но не установленный кодек - ошибка конфигурации.
+    """
+    if name == "auto":
+        for factory in (OrjsonCodec, MsgspecCodec):
+            try:
+                return factory()
+            except ImportError:
+                continue
+        return JsonCodec()
+
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec '{name}', expected one of: auto, {', '.join(CODECS)}")
+    try:
+        return CODECS[name]()
+    except ImportError as e:
+        raise ValueError(f"JSON codec '{name}' is not installed: {e}") from e
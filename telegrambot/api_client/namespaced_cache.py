@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterator, Optional
+
+from cachetools import LRUCache, TTLCache
+
+from context import request_context
+
+_MISSING = object()
+
+DEFAULT_ENTRY_SIZE = 256  # Оценка размера значения без _cache_size (байт)
+
+
+def payload_size(value: Any) -> int:
+    """
+    Размер значения для бюджета кеша: размер исходного JSON-ответа,
+    который документ/ресурс получает при разборе (атрибут _cache_size).
+    """
+    return getattr(value, "_cache_size", DEFAULT_ENTRY_SIZE)
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """
+    Бюджеты кешей API-клиента в байтах исходного JSON.
+
+    Бюджет применяется к каждому из трех кешей сессии отдельно. Верхняя граница одного кеша:
+    public_bytes + max_users * user_bytes.
+
+    Бюджет считается в байтах исходного JSON, а не в памяти процесса: разобранный JSON
+    занимает примерно в 6 раз больше (справочник групп: 1 MiB ответа - около 6 MiB dict/str),
+    ResourceObject и DTO поверх него - еще больше. Лимиты пода выбираются с этим запасом.
+    """
+    public_bytes: int = 16 * 1024 * 1024  # Общие данные (запросы без HMAC)
+    user_bytes: int = 256 * 1024          # Данные одного пользователя
+    max_users: int = 2_000                # Пространств пользователей в кеше одновременно
+    ttl: float = 600                      # Время жизни записи (сек)
+
+
+class CacheStats:
+    """Счетчики обращений к кешу."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0      # Вытеснены из-за превышения бюджета
+        self.expirations = 0    # Удалены по TTL
+        self.rejected = 0       # Не помещены: значение больше бюджета пространства
+
+
+class _BudgetedTTLCache(TTLCache):
+    """TTLCache с бюджетом в байтах, ведущий учет вытеснений в общем CacheStats."""
+
+    def __init__(self, maxsize: int, ttl: float, stats: CacheStats):
+        super().__init__(maxsize=maxsize, ttl=ttl, getsizeof=payload_size)
+        self._stats = stats
+
+    def popitem(self):
+        item = super().popitem()
+        self._stats.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self._stats.expirations += len(expired)
+        return expired
+
+
+class NamespacedCache:
+    """
+    Двухуровневый кеш API-клиента.
+
+    Публичные данные (запросы без HMAC) лежат в общем пространстве "public".
+    Данные пользователя (запросы с HMAC) - в собственном пространстве пользователя
+    с отдельным бюджетом и TTL. Пространства пользователей вытесняются по LRU,
+    поэтому несколько активных пользователей не могут вытеснить публичные документы.
+
+    Пространство выбирается по request_context одним чтением ContextVar на операцию,
+    ключи хранятся как есть (без обертки и префикса).
+    Размер пространств ограничен в байтах исходного JSON (см. payload_size).
+    """
+
+    def __init__(self, config: CacheConfig = CacheConfig()):
+        self.config = config
+        self.stats = CacheStats()
+        self._public = _BudgetedTTLCache(config.public_bytes, config.ttl, self.stats)
+        self._users: LRUCache = LRUCache(maxsize=config.max_users)
+
+    def _new_namespace(self) -> TTLCache:
+        return _BudgetedTTLCache(self.config.user_bytes, self.config.ttl, self.stats)
+
+    def _namespace(self, create: bool = False) -> Optional[TTLCache]:
+        ctx = request_context.get()
+        if not ctx.get("hmac", False):
+            return self._public
+
+        user_id = ctx.get("user_id", "anonymous")
+        namespace = self._users.get(user_id)
+        if namespace is None and create:
+            namespace = self._users[user_id] = self._new_namespace()
+        return namespace
+
+    def __getitem__(self, key: Hashable) -> Any:
+        namespace = self._namespace()
+        if namespace is None or key not in namespace:
+            self.stats.misses += 1
+            raise KeyError(key)
+        self.stats.hits += 1
+        return namespace[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        namespace = self._namespace(create=True)
+        try:
+            namespace[key] = value
+        except ValueError:
+            # Значение больше бюджета пространства: не кешируем и убираем прежнюю версию
+            self.stats.rejected += 1
+            namespace.pop(key, None)
+
+    def __delitem__(self, key: Hashable) -> None:
+        namespace = self._namespace()
+        if namespace is None:
+            raise KeyError(key)
+        del namespace[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        namespace = self._namespace()
+        return namespace is not None and key in namespace
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        namespace = self._namespace()
+        value = _MISSING if namespace is None else namespace.get(key, _MISSING)
+        if value is _MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return value
+
+    def pop(self, key: Hashable, default: Any = _MISSING) -> Any:
+        namespace = self._namespace()
+        if namespace is not None and key in namespace:
+            return namespace.pop(key)
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def _all_namespaces(self) -> Iterator[TTLCache]:
+        yield self._public
+        yield from list(self._users.values())
+
+    def values(self) -> Iterator[Any]:
+        """Значения всех пространств (используется jsonapi_client при invalidate)."""
+        for namespace in self._all_namespaces():
+            yield from list(namespace.values())
+
+    def __len__(self) -> int:
+        return sum(len(namespace) for namespace in self._all_namespaces())
+
+    @property
+    def currsize(self) -> int:
+        """Текущий объем кеша в байтах исходного JSON."""
+        return sum(namespace.currsize for namespace in self._all_namespaces())
+
+    def clear(self) -> None:
+        self._public.clear()
+        self._users.clear()
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Удаляет все закешированные данные пользователя."""
+        self._users.pop(user_id, None)
+
+    def stats_dict(self) -> dict:
+        return {
+            "entries": len(self),
+            "bytes": self.currsize,
+            "public_bytes": self._public.currsize,
+            "users": len(self._users),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "rejected": self.stats.rejected,
+        }
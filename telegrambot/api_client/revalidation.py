@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RevalidationPolicy:
+    """
+    Политика stale-while-revalidate для закешированного документа с ETag.
+
+    - возраст < soft_ttl: документ отдается без запроса к серверу;
+    - soft_ttl <= возраст < hard_ttl: документ отдается сразу, а ревалидация идет в фоне;
+    - возраст >= hard_ttl: вызывающий ждет ревалидации (If-None-Match).
+    """
+    soft_ttl: float = 0
+    hard_ttl: float = 0
+
+
+class RevalidationPolicies:
+    """Политики ревалидации по типу ресурса (первому сегменту пути URL после url_prefix)."""
+
+    def __init__(
+            self,
+            url_prefix: str,
+            policies: Optional[dict[str, dict]] = None,
+            default: RevalidationPolicy = RevalidationPolicy(),
+    ):
+        self._url_prefix = url_prefix
+        self._default = default
+        self._policies = {
+            resource_type: RevalidationPolicy(**policy)
+            for resource_type, policy in (policies or {}).items()
+        }
+
+    def resource_type(self, url) -> str:
+        path = str(url)
+        if path.startswith(self._url_prefix):
+            path = path[len(self._url_prefix):]
+        return path.lstrip("/").split("?", 1)[0].split("/", 1)[0]
+
+    def resolve(self, url) -> RevalidationPolicy:
+        if not self._policies:
+            return self._default
+        return self._policies.get(self.resource_type(url), self._default)
@@ -1,37 +1,119 @@
 import asyncio
-from functools import wraps, partial
+import inspect
+from functools import partial, wraps
+from typing import Awaitable, Callable, Hashable, Optional, ParamSpec, TypeVar
+
+from cachetools import TTLCache
 
-from typing import Callable, TypeVar, ParamSpec
 from context import get_context_prefix
 
 P = ParamSpec("P")  # Для параметров декорируемой функции
 R = TypeVar("R")    # Для возвращаемого значения
 
 
-def thunder_protection(prefix: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
-    tasks: dict[str, asyncio.Task] = {}
+class SingleFlight:
+    """
+    Single-flight: одновременные вызовы с одинаковым ключом выполняются один раз,
+    остальные вызывающие ждут результат "лидера".
 
-    def _decor(func: Callable[P, R]) -> Callable[P, R]:
-        def done_callback(_key: str, _: asyncio.Task):
-            tasks.pop(_key, None)
+    Общая задача защищена от отмены отдельных ожидающих (asyncio.shield):
+    отмена одного вызывающего не отменяет загрузку для остальных.
+    При result_ttl > 0 готовый результат дополнительно отдается из короткого кеша.
+    """
+    _registry: dict[str, list["SingleFlight"]] = {}
 
-        @wraps(func)
-        async def _wrapper(*args, **kwargs):
-            # Формируем ключ строго: <context_prefix><prefix>:<arg1>:<arg2>:...:<k=v>
-            parts = [str(a) for a in args]
-            parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            full_key = get_context_prefix() + prefix
-            if parts:
-                full_key += ":" + ":".join(parts)
+    def __init__(self, prefix: str, result_ttl: float = 0, maxsize: int = 1024):
+        self.prefix = prefix
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._results: Optional[TTLCache] = TTLCache(maxsize=maxsize, ttl=result_ttl) if result_ttl > 0 else None
+
+        self.leader_calls = 0       # Вызовы, которые действительно выполнили функцию
+        self.coalesced_calls = 0    # Вызовы, присоединившиеся к уже выполняющейся задаче
+        self.cached_calls = 0       # Вызовы, обслуженные из кеша результатов
+
+        SingleFlight._registry.setdefault(prefix, []).append(self)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[R]]) -> R:
+        if self._results is not None and key in self._results:
+            self.cached_calls += 1
+            return self._results[key]
+
+        task = self._tasks.get(key)
+        if task is None:
+            self.leader_calls += 1
+            task = asyncio.create_task(factory())
+            self._tasks[key] = task
+            task.add_done_callback(partial(self._on_done, key))
+        else:
+            self.coalesced_calls += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        # exception() также помечает ошибку как полученную, если все ожидающие были отменены
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._results is not None:
+            self._results[key] = task.result()
 
-            if full_key in tasks:
-                return await tasks[full_key]
+    @classmethod
+    def stats(cls) -> dict[str, dict[str, int]]:
+        """Счетчики лидеров/схлопнутых/кешированных вызовов по префиксам ключей."""
+        return {
+            prefix: {
+                "leader": sum(f.leader_calls for f in flights),
+                "coalesced": sum(f.coalesced_calls for f in flights),
+                "cached": sum(f.cached_calls for f in flights),
+                "in_flight": sum(len(f._tasks) for f in flights),
+            }
+            for prefix, flights in cls._registry.items()
+        }
 
-            task = asyncio.create_task(func(*args, **kwargs))
-            tasks[full_key] = task
-            task.add_done_callback(partial(done_callback, full_key))
-            return await task
 
+def _default_key(func: Callable) -> Callable[..., Hashable]:
+    """
+    Ключ из аргументов вызова. Аргументы должны быть хешируемыми.
+    self/cls входит в ключ как id(): вызовы на разных экземплярах (например, сессиях
+    с разными настройками) не получают результат друг друга. Пока вызов выполняется,
+    задача держит ссылку на экземпляр, поэтому id не может быть переиспользован.
+    """
+    params = list(inspect.signature(func).parameters)
+    bound = bool(params) and params[0] in ("self", "cls")
+
+    def key(*args, **kwargs) -> Hashable:
+        if bound:
+            return id(args[0]), args[1:], tuple(sorted(kwargs.items()))
+        return args, tuple(sorted(kwargs.items()))
+
+    return key
+
+
+def thunder_protection(
+        prefix: str,
+        key: Optional[Callable[..., Hashable]] = None,
+        result_ttl: float = 0,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """
+    Декоратор single-flight для корутин.
+
+    Ключ: (<context_prefix>, <prefix>, key(*args, **kwargs)).
+    По умолчанию key - id(self/cls) и кортеж остальных аргументов; для нехешируемых аргументов
+    или для исключения лишних (например, внедряемых зависимостей) передается явная функция key.
+    Явный key тоже включает id(self), если вызовы разных экземпляров не должны схлопываться.
+    """
+    def _decor(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        flight = SingleFlight(prefix, result_ttl=result_ttl)
+        key_func = key or _default_key(func)
+
+        @wraps(func)
+        async def _wrapper(*args, **kwargs):
+            full_key = (get_context_prefix(), prefix, key_func(*args, **kwargs))
+            return await flight.run(full_key, partial(func, *args, **kwargs))
+
+        _wrapper.single_flight = flight
         return _wrapper
 
     return _decor
@@ -1,4 +1,5 @@
 import re
+from typing import Iterable, Iterator
 
 
 # Функции для Monkey-patch пакета jsonapi_client:
@@ -7,14 +8,40 @@ import re
 # Так как DRF JSON API настроен на camelCase (shortTitle), переопределяем функции сериализации,
 # чтобы атрибуты корректно отображались и были доступны как обычные свойства: faculty.short_title.
 
+# jsonapi_client вызывает преобразование при каждом обращении к атрибуту ресурса,
+# поэтому результаты хранятся в таблицах: известные поля заполняются заранее
+# (precompute_attribute_names), остальные - при первом обращении, пока таблица не заполнена.
+NAME_TABLE_MAXSIZE = 4096
+
+_DECAMELIZE_RE = re.compile(r"(?<!^)(?=[A-Z])")
+
+_camelized: dict[str, str] = {}
+_decamelized: dict[str, str] = {}
+
+
+def _camelize(name: str) -> str:
+    name = name.replace('__', '.')
+    parts = name.split("_")
+    return parts[0] + "".join(p.capitalize() for p in parts[1:])
+
+
+def _decamelize(name: str) -> str:
+    name = name.replace('.', '__')
+    return _DECAMELIZE_RE.sub("_", name).lower()
+
+
 def camelize_attribute_name(name: str) -> str:
     """
     Преобразует snake_case строку в camelCase.
     Используется для преобразования python -> JSON:API
     """
-    name = name.replace('__', '.')
-    parts = name.split("_")
-    return parts[0] + "".join(p.capitalize() for p in parts[1:])
+    try:
+        return _camelized[name]
+    except KeyError:
+        result = _camelize(name)
+        if len(_camelized) < NAME_TABLE_MAXSIZE:
+            _camelized[name] = result
+        return result
 
 
 def decamelize_attribute_name(name):
@@ -22,5 +49,28 @@ def decamelize_attribute_name(name):
     Преобразует camelCase строку в snake_case.
     Используется для преобразования JSON:API -> python
     """
-    name = name.replace('.', '__')
-    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+    try:
+        return _decamelized[name]
+    except KeyError:
+        result = _decamelize(name)
+        if len(_decamelized) < NAME_TABLE_MAXSIZE:
+            _decamelized[name] = result
+        return result
+
+
+def precompute_attribute_names(names: Iterable[str]) -> int:
+    """Заполняет таблицы преобразований в обе стороны для известных имен полей. Возвращает размер таблиц."""
+    for name in names:
+        for variant in (name, _decamelize(name), _camelize(name)):
+            camelize_attribute_name(variant)
+            decamelize_attribute_name(variant)
+    return len(_camelized) + len(_decamelized)
+
+
+def schema_attribute_names(schema: dict) -> Iterator[str]:
+    """Имена всех полей схемы jsonapi_client (models_as_jsonschema), включая вложенные объекты."""
+    for definition in schema.values():
+        for name, field in definition.get("properties", {}).items():
+            yield name
+            if isinstance(field, dict) and "properties" in field:
+                yield from schema_attribute_names({name: field})
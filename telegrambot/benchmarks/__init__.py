@@ -0,0 +1,21 @@
+"""
+Бенчмарки оптимизаций бота. Запуск из каталога telegrambot:
+
+    python -m benchmarks.<имя модуля>
+
+Сеть, Redis и API не нужны: данные генерируются, внешние сервисы заменены заглушками в памяти.
+"""
+import os
+
+# Обязательные настройки для модулей, читающих config при импорте
+for name, value in {
+    "API_BASE_URL": "http://localhost/api",
+    "HMAC_SECRET": "secret",
+    "BOT_SOCIAL_ID": "1",
+    "BOT_TOKEN": "123:benchmark",
+    "REDIS_STORAGE_URL": "redis://localhost",
+    "STORAGE_STATE_TTL": "3600",
+    "STORAGE_DATA_TTL": "3600",
+    "BASE_SCRAPING_URL": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,39 @@
+"""
+Стоимость упаковки и разбора callback_data: CallbackData aiogram (pydantic) и InternedCallback.
+
+    python -m benchmarks.button_manager
+"""
+import timeit
+
+from aiogram.filters.callback_data import CallbackData
+
+from managers.button_manager import EntityCallback, FacultyCallback, InternedCallback, LessonsCallback
+
+NUMBER = 100_000
+
+
+def per_call(func) -> float:
+    return timeit.timeit(func, number=NUMBER) / NUMBER * 1e6
+
+
+def foreign(unpack):
+    """Разбор чужого callback_data: фильтр каждого обработчика получает и чужие нажатия."""
+    try:
+        unpack(FacultyCallback, "les:context:1day:-3")
+    except (TypeError, ValueError):
+        pass
+
+
+def main():
+    pydantic_unpack = CallbackData.unpack.__func__
+    interned_unpack = InternedCallback.unpack.__func__
+    print(f"pack:           pydantic {per_call(lambda: LessonsCallback(source='context', mode='1day', shift=-3).pack()):.2f} us, "
+          f"interned {per_call(lambda: LessonsCallback.packed('context', '1day', -3)):.2f} us")
+    print(f"unpack:         pydantic {per_call(lambda: pydantic_unpack(EntityCallback, 'e:123')):.2f} us, "
+          f"interned {per_call(lambda: interned_unpack(EntityCallback, 'e:123')):.2f} us")
+    print(f"foreign prefix: pydantic {per_call(lambda: foreign(pydantic_unpack)):.2f} us, "
+          f"interned {per_call(lambda: foreign(interned_unpack)):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Разбор документа с 2000 занятий с прежними (regex/split) и табличными преобразованиями имен атрибутов.
+
+    python -m benchmarks.client_patch
+"""
+import asyncio
+import sys
+import timeit
+
+from api_client import AsyncClientSession, models_as_jsonschema
+from api_client.client_patch import _replace_references, patch_jsonapi_client
+from api_client.utils import _camelize, _decamelize, camelize_attribute_name, decamelize_attribute_name
+from benchmarks.documents import lessons_document
+from dto import LessonDTO
+
+
+async def main():
+    patch_jsonapi_client(verbose=False)
+    common_mod = sys.modules["jsonapi_client.common"]
+    session = AsyncClientSession("http://localhost/api/v1", "telegram", "", schema=models_as_jsonschema)
+    document = lessons_document(2_000, groups=30, teachers=200)
+
+    def parse():
+        doc = session.read(document, no_cache=True)
+        return [LessonDTO.from_jsonapi(lesson) for lesson in doc.resources]
+
+    for title, jsonify, dejsonify in (
+            ("regex/split", _camelize, _decamelize),
+            ("table", camelize_attribute_name, decamelize_attribute_name),
+    ):
+        common_mod.jsonify_attribute_name = jsonify
+        common_mod.dejsonify_attribute_name = dejsonify
+        _replace_references(common_mod, lambda msg: None)
+        elapsed = min(timeit.repeat(parse, number=1, repeat=5))
+        print(f"{title:12} {elapsed * 1000:7.1f} ms for {len(document['data'])} lessons")
+    await session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
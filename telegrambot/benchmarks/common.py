@@ -0,0 +1,44 @@
+import time
+from typing import Callable
+
+from dto import FacultyDTO, GroupDTO, TeacherDTO
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """Лучшее время вызова из repeat, мс."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def make_faculties(count: int = 20) -> list[FacultyDTO]:
+    return [FacultyDTO(id=i, title=f"Факультет {i}", short_title=f"Ф{i}") for i in range(count)]
+
+
+def make_groups(count: int = 5_000, faculties: list[FacultyDTO] | None = None) -> list[GroupDTO]:
+    faculties = faculties or make_faculties()
+    return [
+        GroupDTO(
+            id=i,
+            title=f"Группа-{i}",
+            grade=i % 4 + 1,
+            faculty_id=faculties[i % len(faculties)].id,
+            faculty=faculties[i % len(faculties)],
+        )
+        for i in range(count)
+    ]
+
+
+def make_teachers(count: int = 2_000) -> list[TeacherDTO]:
+    surnames = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Лебедев", "Новиков"]
+    return [
+        TeacherDTO(
+            id=i,
+            full_name=f"{surnames[i % len(surnames)]}{i} Иван Иванович",
+            short_name=f"{surnames[i % len(surnames)]}{i} И.И.",
+        )
+        for i in range(count)
+    ]
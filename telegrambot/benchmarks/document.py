@@ -0,0 +1,59 @@
+"""
+Время и пиковая память разбора справочника из 5000 ресурсов обычным и ленивым документом:
+только разбор, разбор и первый ресурс, разбор и все DTO.
+
+    python -m benchmarks.document
+"""
+import asyncio
+import timeit
+import tracemalloc
+
+from api_client import AsyncClientSession, models_as_jsonschema
+from api_client.client_patch import patch_jsonapi_client
+from api_client.document import CustomDocument
+from benchmarks.documents import groups_document
+from dto import FacultyDTO, GroupDTO
+
+
+def map_groups(document: CustomDocument) -> list[GroupDTO]:
+    included = document.included_by_type().get("faculties", {})
+    faculties = {resource_id: FacultyDTO.from_jsonapi(included[resource_id]) for resource_id in included}
+    return [
+        GroupDTO.from_jsonapi(g, faculty=faculties.get(g.faculty._resource_identifier.id))
+        for g in document.resources
+    ]
+
+
+async def main():
+    patch_jsonapi_client(verbose=False)
+    json_data = groups_document(4_950, 50)
+    for lazy in (False, True):
+        session = AsyncClientSession(
+            "http://localhost/api/v1", "telegram", "", schema=models_as_jsonschema, lazy_documents=lazy,
+        )
+
+        def parse():
+            return session.read(json_data, "groups", payload_size=1_000_000)
+
+        def first():
+            return GroupDTO.from_jsonapi(parse().resources[0])
+
+        def parse_and_map():
+            return map_groups(parse())
+
+        results = []
+        for func in (parse, first, parse_and_map):
+            session.resources_by_resource_identifier.clear()
+            session.resources_by_link.clear()
+            elapsed = min(timeit.repeat(func, number=1, repeat=7))
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append(f"{func.__name__} {elapsed * 1000:6.1f} ms {peak / 2**20:5.1f} MiB")
+        print(f"{'lazy ' if lazy else 'eager'}  " + " | ".join(results))
+        await session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+"""Генераторы JSON:API документов в формате ответов API для бенчмарков."""
+
+
+def group_resource(i: int, faculties: int) -> dict:
+    return {
+        "type": "groups", "id": str(i),
+        "attributes": {"title": f"Группа {i}", "grade": i % 5 + 1, "link": None},
+        "relationships": {"faculty": {"data": {"type": "faculties", "id": str(i % faculties)}}},
+        "links": {"self": f"https://api.example.com/api/v1/groups/{i}/"},
+    }
+
+
+def faculty_resource(i: int) -> dict:
+    return {"type": "faculties", "id": str(i), "attributes": {"title": f"Факультет {i}", "shortTitle": f"Ф{i}"}}
+
+
+def teacher_resource(i: int) -> dict:
+    return {
+        "type": "teachers", "id": str(i),
+        "attributes": {"fullName": f"Иванов{i} Иван Иванович", "shortName": f"Иванов{i} И.И.", "link": None},
+    }
+
+
+def groups_document(count: int = 5_000, faculties: int = 40) -> dict:
+    """Справочник групп с факультетами в included."""
+    return {
+        "data": [group_resource(i, faculties) for i in range(count)],
+        "included": [faculty_resource(i) for i in range(faculties)],
+    }
+
+
+def teachers_document(count: int = 3_000) -> dict:
+    return {"data": [teacher_resource(i) for i in range(count)]}
+
+
+def lessons_document(count: int = 36, groups: int = 1, teachers: int = 12) -> dict:
+    """Занятия с группами и преподавателями в included: 36 - неделя занятий одной группы."""
+    return {
+        "data": [
+            {
+                "type": "lessons", "id": str(i),
+                "attributes": {
+                    "number": i % 6 + 1, "date": f"2025-{i // 168 % 12 + 1:02}-{i // 6 % 28 + 1:02}",
+                    "startTime": f"{8 + i % 6 * 2:02}:00:00", "endTime": f"{9 + i % 6 * 2:02}:30:00",
+                    "subject": f"Математический анализ {i % 15}", "classroom": f"ауд. {100 + i % 30}",
+                    "subgroup": str(i % 3),
+                },
+                "relationships": {
+                    "group": {"data": {"type": "groups", "id": str(i % groups)}},
+                    "teacher": {"data": {"type": "teachers", "id": str(i % teachers)}},
+                },
+            }
+            for i in range(count)
+        ],
+        "included": [
+            *(group_resource(i, faculties=1) for i in range(groups)),
+            *(teacher_resource(i) for i in range(teachers)),
+        ],
+    }
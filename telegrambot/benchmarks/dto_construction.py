@@ -0,0 +1,92 @@
+"""
+Создание, хеширование и память DTO справочников и занятий из исходного JSON:
+from_json с валидацией pydantic против model_construct после явной проверки типов.
+
+    python -m benchmarks.dto_construction
+"""
+import gc
+import timeit
+import tracemalloc
+from sys import intern
+
+from benchmarks.documents import faculty_resource, groups_document, lessons_document, teachers_document
+from dto import FacultyDTO, GroupDTO, LessonDTO, TeacherDTO
+
+
+def checked_str(value) -> str:
+    if not isinstance(value, str):
+        raise TypeError(f"Expected str, got {type(value).__name__}")
+    return value
+
+
+def checked_optional_str(value):
+    return None if value is None else checked_str(value)
+
+
+def constructed_group(g: dict, faculty: FacultyDTO) -> GroupDTO:
+    a = g["attributes"]
+    return GroupDTO.model_construct(
+        id=int(g["id"]), title=checked_str(a["title"]), grade=int(a["grade"]), link=checked_optional_str(a.get("link")),
+        faculty_id=int(g["relationships"]["faculty"]["data"]["id"]), faculty=faculty,
+    )
+
+
+def constructed_teacher(t: dict) -> TeacherDTO:
+    a = t["attributes"]
+    return TeacherDTO.model_construct(
+        id=int(t["id"]), full_name=checked_str(a["fullName"]), short_name=checked_str(a["shortName"]),
+        link=checked_optional_str(a.get("link")),
+    )
+
+
+def constructed_lesson(l: dict, group: GroupDTO, teacher: TeacherDTO) -> LessonDTO:
+    a = l["attributes"]
+    return LessonDTO.model_construct(
+        id=int(l["id"]), number=int(a["number"]), date=intern(checked_str(a["date"])),
+        startTime=intern(checked_str(a["startTime"])), endTime=intern(checked_str(a["endTime"])),
+        subject=intern(checked_str(a["subject"])), classroom=intern(checked_str(a["classroom"])),
+        subgroup=intern(checked_str(a["subgroup"])), group=group, teacher=teacher,
+    )
+
+
+def measure(build):
+    gc.collect()
+    elapsed = min(timeit.repeat(build, number=1, repeat=3))
+    objects = build()
+    hashing = min(timeit.repeat(lambda: [hash(obj) for obj in objects], number=1, repeat=3))
+    del objects
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, elapsed * 1000, hashing * 1000, size / 2 ** 20
+
+
+def main():
+    groups_json = groups_document(10_000, faculties=1)["data"]
+    teachers_json = teachers_document(10_000)["data"]
+    lessons_json = lessons_document(100_000)["data"]
+
+    faculty = FacultyDTO.from_json(faculty_resource(0))
+    group, teacher = GroupDTO.from_json(groups_json[0], faculty), TeacherDTO.from_json(teachers_json[0])
+    cases = {
+        "groups 10k": (lambda: [GroupDTO.from_json(g, faculty) for g in groups_json],
+                       lambda: [constructed_group(g, faculty) for g in groups_json]),
+        "teachers 10k": (lambda: [TeacherDTO.from_json(t) for t in teachers_json],
+                         lambda: [constructed_teacher(t) for t in teachers_json]),
+        "lessons 100k": (lambda: [LessonDTO.from_json(l, group, teacher) for l in lessons_json],
+                         lambda: [constructed_lesson(l, group, teacher) for l in lessons_json]),
+    }
+
+    print("validated -> model_construct")
+    for case, (validated, constructed) in cases.items():
+        slow, slow_build, slow_hash, slow_size = measure(validated)
+        fast, fast_build, fast_hash, fast_size = measure(constructed)
+        assert slow == fast, case
+        print(f"{case:13} build {slow_build:7.1f} -> {fast_build:7.1f} ms | hash {slow_hash:5.1f} -> {fast_hash:5.1f} ms"
+              f" | memory {slow_size:5.1f} -> {fast_size:5.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Разбор ответов справочников и недели занятий установленными кодеками, а также
+кодирование и разбор снимка справочника групп на диске.
+
+    python -m benchmarks.json_codec
+"""
+import json
+import timeit
+
+from api_client.json_codec import JsonCodec, get_codec
+from benchmarks.common import make_groups
+from benchmarks.documents import groups_document, lessons_document, teachers_document
+from services.directories import GroupDirectory
+
+
+def best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    payloads = {
+        name: JsonCodec().dumps(data)
+        for name, data in (
+            ("groups", groups_document(5_000)),
+            ("teachers", teachers_document(3_000)),
+            ("lessons", lessons_document(36)),
+            ("snapshot", GroupDirectory.build(make_groups()).to_snapshot()),
+        )
+    }
+
+    codecs = [JsonCodec()]
+    for codec_name in ("orjson", "msgspec"):
+        try:
+            codecs.append(get_codec(codec_name))
+        except ValueError as e:
+            print(f"skip: {e}")
+
+    for payload_name, payload in payloads.items():
+        number = 2_000 if payload_name == "lessons" else 10
+        data = json.loads(payload)
+        # Прежний путь: response.json() декодирует bytes в str и только затем разбирает JSON
+        line = [f"text+json.loads {best(lambda: json.loads(payload.decode('utf-8')), number):.3f} ms"]
+        for codec in codecs:
+            line.append(f"{codec.name}.loads {best(lambda: codec.loads(payload), number):.3f} ms")
+            line.append(f"{codec.name}.dumps {best(lambda: codec.dumps(data), number):.3f} ms")
+        print(f"{payload_name:8} {len(payload) / 1024:6.0f} KiB: " + ", ".join(line))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Разбор справочников и недели занятий репозиториями: через ResourceObject и из исходного JSON
+(ленивые документы + fast_decode). Ответы API подставляются вместо запросов.
+
+    python -m benchmarks.json_decoding
+"""
+import asyncio
+import time
+
+import yarl
+
+from api_client import AsyncClientSession, models_as_jsonschema
+from api_client.client_patch import patch_jsonapi_client
+from benchmarks.documents import groups_document, lessons_document, teachers_document
+from dto import DateSpanDTO, GroupDTO
+from repositories import JsonApiGroupRepository, JsonApiLessonRepository, JsonApiTeacherRepository
+
+
+async def main():
+    patch_jsonapi_client(verbose=False)
+    payloads = {"groups": groups_document(5_000), "teachers": teachers_document(3_000), "lessons": lessons_document(36)}
+    group = GroupDTO(id=0, title="Группа 0", grade=1, faculty_id=0)
+    span = DateSpanDTO(start="2025-01-01", end="2025-01-07")
+
+    results = {}
+    for title, lazy, fast in (("ResourceObject", False, False), ("lazy+fast", True, True)):
+        session = AsyncClientSession(
+            "http://localhost/api/v1", "telegram", "", schema=models_as_jsonschema, lazy_documents=lazy,
+        )
+
+        async def fetch(url, revalidate=False, session=session):
+            return session.read(payloads[yarl.URL(str(url)).path.split("/")[-2]], str(url), no_cache=True)
+
+        session.fetch_document_by_url_async = fetch
+        lesson_repo = JsonApiLessonRepository(session, fast_decode=fast)
+        cases = {
+            "groups+faculties": JsonApiGroupRepository(session, fast_decode=fast).get_groups_with_faculties,
+            "teachers": JsonApiTeacherRepository(session, fast_decode=fast).get_teachers,
+            "lessons (week)": lambda: lesson_repo.get_lessons(group, span),
+        }
+        for case, call in cases.items():
+            repeat = 200 if case.startswith("lessons") else 5
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                dtos = await call()
+                best = min(best, time.perf_counter() - started)
+            results.setdefault(case, []).append((title, best, dtos))
+        await session.close()
+
+    for case, ((_, slow, slow_dtos), (_, fast, fast_dtos)) in results.items():
+        assert slow_dtos == fast_dtos, case
+        print(f"{case:18} {slow * 1000:8.2f} ms -> {fast * 1000:7.2f} ms  x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
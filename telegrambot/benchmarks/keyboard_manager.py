@@ -0,0 +1,51 @@
+"""
+Стоимость нажатия (попадание в кеш) с ключом по кортежу DTO и по версии раздела справочника.
+
+    python -m benchmarks.keyboard_manager
+"""
+import timeit
+
+from cachetools.func import ttl_cache
+
+from dto import FacultyDTO, GroupDTO, TeacherDTO
+from managers.keyboard_manager import KeyboardManager
+from services.directories import GroupDirectory, TeacherDirectory
+
+NUMBER = 20_000
+
+
+def main():
+    faculty = FacultyDTO(id=1, title="Факультет", short_title="Ф")
+    groups = [GroupDTO(id=i, title=f"Группа-{i}", grade=1, faculty_id=1, faculty=faculty) for i in range(60)]
+    teachers = [TeacherDTO(id=i, full_name=f"Иванов{i} Иван", short_name=f"Иванов{i} И.") for i in range(60)]
+    group_directory = GroupDirectory.build(groups)
+    teacher_directory = TeacherDirectory.build(teachers)
+
+    # Прежний вариант: ttl_cache с ключом по кортежу DTO
+    @ttl_cache(maxsize=128, ttl=600)
+    def groups_keyboard_by_dtos(dtos):
+        return KeyboardManager.get_groups_keyboard.__wrapped__(KeyboardManager, group_directory, 1, 1)
+
+    @ttl_cache(maxsize=33, ttl=600)
+    def teachers_keyboard_by_dtos(dtos):
+        return KeyboardManager.get_teachers_keyboard.__wrapped__(KeyboardManager, teacher_directory, "И")
+
+    bucket = group_directory.groups_by_faculty_grade[(1, 1)]
+    letter_bucket = teacher_directory.teachers_by_bucket["И"]
+    cases = {
+        "groups (60), no cache": lambda: KeyboardManager.get_groups_keyboard.__wrapped__(
+            KeyboardManager, group_directory, 1, 1
+        ),
+        "groups (60), DTO tuple key": lambda: groups_keyboard_by_dtos(bucket),
+        "groups (60), version key": lambda: KeyboardManager.get_groups_keyboard(group_directory, 1, 1),
+        "teachers (60), DTO tuple key": lambda: teachers_keyboard_by_dtos(letter_bucket),
+        "teachers (60), version key": lambda: KeyboardManager.get_teachers_keyboard(teacher_directory, "И"),
+    }
+    for name, case in cases.items():
+        case()
+        number = NUMBER // 100 if name.endswith("no cache") else NUMBER
+        print(f"{name}: {timeit.timeit(case, number=number) / number * 1e6:.2f} us/tap")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Задержка get_lessons в зависимости от числа занятий: связанные группы и преподаватели из included
+за один проход с пакетной догрузкой недостающих против прежних последовательных fetch на каждое занятие,
+а также тот же проход из исходного JSON (ленивые документы + fast_decode).
+Ответ API подставляется вместо HTTP-запроса с задержкой сети LATENCY на каждый запрос.
+
+    python -m benchmarks.lesson_repository
+"""
+import asyncio
+import statistics
+import time
+
+import yarl
+from jsonapi_client import Filter, Inclusion, Modifier
+
+from api_client import AsyncClientSession, models_as_jsonschema
+from api_client.client_patch import patch_jsonapi_client
+from benchmarks.documents import group_resource, lessons_document, teacher_resource
+from dto import DateSpanDTO, GroupDTO, LessonDTO
+from repositories import JsonApiLessonRepository
+
+LATENCY = 0.002     # 2 мс - API в той же сети
+REPEAT = 50
+TEACHERS = 12
+
+
+async def n_plus_one(repo: JsonApiLessonRepository, obj: GroupDTO, date_span: DateSpanDTO) -> list[LessonDTO]:
+    """Прежний путь: связанные ресурсы запрашиваются по очереди для каждого занятия."""
+    modifier = sum([
+        Filter(**{obj.relation_name: obj.id}),
+        Filter(date_from=date_span.start_str),
+        Filter(date_to=date_span.end_str),
+        Inclusion(*repo.included_rel_names),
+    ], Modifier())
+    document = await repo.api_client.get(repo.resource_name, modifier)
+    lessons, cache = [], {}
+    for lesson in document.resources:
+        related = {}
+        for rel_name in ("group", "teacher"):
+            identifier = repo._get_related_identifier(lesson, rel_name)
+            resource = await repo.api_client.fetch_resource_by_resource_identifier_async(identifier)
+            related[rel_name] = repo._get_or_create_dto(resource, cache)
+        lessons.append(LessonDTO.from_jsonapi(lesson, related["group"], related["teacher"]))
+    return lessons
+
+
+def fake_api(session: AsyncClientSession, lessons: dict) -> list[str]:
+    """Подменяет HTTP-запросы сессии ответами из памяти, возвращает журнал запрошенных URL."""
+    requests = []
+
+    async def fetch_json(url, etag=None):
+        requests.append(url)
+        await asyncio.sleep(LATENCY)
+        resource_type, resource_id = yarl.URL(url).path.rstrip("/").split("/")[-2:]
+        if resource_id == "lessons":
+            return lessons, None, 0
+        resource = group_resource(int(resource_id), 1) if resource_type == "groups" else teacher_resource(int(resource_id))
+        return {"data": resource}, None, 0
+
+    session._fetch_json_async = fetch_json
+    return requests
+
+
+async def measure(call, session: AsyncClientSession, requests: list[str]) -> tuple[float, int]:
+    """Медианная задержка холодного запроса (кеши сессии очищаются) и число запросов к API."""
+    timings = []
+    for _ in range(REPEAT):
+        session.documents_by_link.clear()
+        session.resources_by_resource_identifier.clear()
+        requests.clear()
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(requests)
+
+
+async def main():
+    patch_jsonapi_client(verbose=False)
+    group = GroupDTO(id=0, title="Группа 0", grade=1, faculty_id=0)
+    span = DateSpanDTO(start="2025-01-01", end="2025-01-31")
+
+    print(f"API latency {LATENCY * 1000:.0f} ms, median of {REPEAT} cold requests")
+    for included in (True, False):
+        print("related resources in included" if included else "related resources not included")
+        for count in (6, 36, 120, 360):
+            lessons = lessons_document(count, groups=1, teachers=TEACHERS)
+            if not included:
+                del lessons["included"]
+            session = AsyncClientSession("http://localhost/api/v1", "telegram", "", schema=models_as_jsonschema)
+            requests = fake_api(session, lessons)
+            repo = JsonApiLessonRepository(session)
+            lazy_session = AsyncClientSession(
+                "http://localhost/api/v1", "telegram", "", schema=models_as_jsonschema, lazy_documents=True,
+            )
+            lazy_requests = fake_api(lazy_session, lessons)
+            fast_repo = JsonApiLessonRepository(lazy_session, fast_decode=True)
+
+            old, old_requests = await measure(lambda: n_plus_one(repo, group, span), session, requests)
+            new, new_requests = await measure(lambda: repo.get_lessons(group, span), session, requests)
+            fast, _ = await measure(lambda: fast_repo.get_lessons(group, span), lazy_session, lazy_requests)
+            expected = await n_plus_one(repo, group, span)
+            assert expected == await repo.get_lessons(group, span) == await fast_repo.get_lessons(group, span)
+            print(f"  {count:4} lessons: per-lesson fetch {old:7.2f} ms ({old_requests} requests)"
+                  f" -> one pass {new:6.2f} ms ({new_requests} requests), lazy+fast {fast:6.2f} ms")
+            for client in (session, lazy_session):
+                await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""
+Стоимость поиска в NamespacedCache, память на 10k записей и соблюдение байтового бюджета.
+
+    python -m benchmarks.namespaced_cache
+"""
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+
+from api_client.namespaced_cache import CacheConfig, NamespacedCache
+from context import request_context
+
+ENTRIES = 10_000
+
+
+def main():
+    tracemalloc.start()
+    cache = NamespacedCache(CacheConfig(public_bytes=ENTRIES * 1024))
+    for i in range(ENTRIES):
+        cache[f"https://api/lessons/{i}/"] = SimpleNamespace(_cache_size=1024)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    request_context.set({"user_id": "1", "hmac": False})
+    lookup = timeit.timeit(lambda: cache.get("https://api/lessons/5000/"), number=100_000) / 100_000
+    request_context.set({"user_id": "1", "hmac": True})
+    user_lookup = timeit.timeit(lambda: cache.get("https://api/lessons/5000/"), number=100_000) / 100_000
+
+    print(f"public lookup: {lookup * 1e9:.0f} ns, user lookup (miss): {user_lookup * 1e9:.0f} ns")
+    print(f"memory per {ENTRIES} entries: {memory / 1024:.0f} KiB")
+
+    # Бюджет соблюдается независимо от числа записей: 10k документов по 1 КиБ в бюджете 1 МиБ
+    request_context.set({"user_id": "1", "hmac": False})
+    bounded = NamespacedCache(CacheConfig(public_bytes=1024 * 1024))
+    for i in range(ENTRIES):
+        bounded[f"https://api/groups/{i}/"] = SimpleNamespace(_cache_size=1024)
+    print(f"bounded: {bounded.stats_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Стоимость поиска по 10k названий: SearchIndex против перебора с проверкой подстроки.
+Перебор не находит опечатки и "е" вместо "ё", поэтому его время - нижняя граница.
+
+    python -m benchmarks.search_index
+"""
+import random
+import time
+import timeit
+
+from services.search_index import SearchIndex
+
+NUMBER = 2_000
+
+
+def make_corpus() -> list[tuple[int, str]]:
+    random.seed(1)
+    surnames = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Попов", "Лебедев", "Ёлкин", "Новиков", "Морозов"]
+    names = ["Иван", "Петр", "Сергей", "Алексей", "Дмитрий", "Андрей", "Михаил", "Никита", "Олег", "Юрий"]
+    corpus = [
+        (i, f"{random.choice(surnames)}{i % 500 or ''} {random.choice(names)} {random.choice(names)}ович")
+        for i in range(8_000)
+    ]
+    corpus += [(8_000 + i, f"ИСП-{i // 10}{i % 10}-{i % 4 + 1}") for i in range(2_000)]
+    return corpus
+
+
+def main():
+    corpus = make_corpus()
+    lowered = [(i, name.lower()) for i, name in corpus]
+
+    started = time.perf_counter()
+    index = SearchIndex(corpus)
+    print(f"build: {(time.perf_counter() - started) * 1000:.1f} ms for {len(index)} names")
+
+    for query in ["и", "иван", "иванов12 серг", "елкин", "ивонов12", "исп-12", "кузнецв олег"]:
+        elapsed = timeit.timeit(lambda: index.search(query), number=NUMBER) / NUMBER
+        scan = timeit.timeit(lambda: [i for i, name in lowered if query in name][:10], number=NUMBER // 10) / (NUMBER // 10)
+        top = [corpus[i][1] for i in index.search(query, limit=2)]
+        print(f"{query!r:18} index {elapsed * 1e6:8.1f} us, scan {scan * 1e6:8.1f} us  {top}")
+
+
+if __name__ == "__main__":
+    main()
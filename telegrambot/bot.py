@@ -8,6 +8,7 @@ patch_jsonapi_client(verbose=True)
 import asyncio
 import logging
 import sys
+import time
 
 from config import settings
 from dependencies import Deps
@@ -20,10 +21,11 @@ from handlers import (
     teacher_router,
     navigation_router,
     subscription_router,
-    lessons_router
+    lessons_router,
+    search_router,
 )
-from middleware import UserContextMiddleware
-from tasks import setup_periodic_task_scheduler
+from middleware import StateSessionMiddleware, UserContextMiddleware
+from tasks import prebuild_keyboards, refresh_directories, setup_periodic_task_scheduler
 
 from aiogram import Bot, Dispatcher
 
@@ -31,10 +33,35 @@ logging.basicConfig(level=getattr(logging, settings.log_level), stream=sys.stdou
 logger = logging.getLogger(__name__)
 
 
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def load_directories(deps: Deps) -> None:
+    """
+    Первичная загрузка справочников для клавиатур.
+    При наличии снимков на диске бот стартует с ними, а обновление из API идет в фоне.
+    Без снимков (первый запуск) ожидаем ответа API.
+    """
+    started = time.perf_counter()
+    restored = [deps.services.teacher().restore(), deps.services.group().restore()]
+
+    if all(restored):
+        task = asyncio.create_task(refresh_directories(deps))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        source = "snapshot"
+    else:
+        await asyncio.gather(deps.services.teacher().refresh(), deps.services.group().refresh())
+        source = "API"
+    prebuild_keyboards(deps, schedule=True)
+    await deps.services.search().rebuild()
+
+    logger.info(f"Directories loaded from {source} in {(time.perf_counter() - started) * 1000:.1f} ms.")
+
+
 async def on_startup(deps: Deps, bot: Bot):
     deps.api_client()                               # Создаем API-client
-    await deps.services.teacher().refresh()         # Первичное получение учителей для клавиатур
-    await deps.services.group().refresh()           # Первичное получение групп для клавиатур
+    await load_directories(deps)                    # Справочники для клавиатур: снимок или API
     await setup_periodic_task_scheduler(deps=deps)  # Запуск планировщика
 
     # Добавление Меню команд
@@ -55,7 +82,13 @@ async def main():
 
     bot = container.bot()
     storage = container.storage()
-    dp = Dispatcher(bot=bot, storage=storage, deps=container)
+    # Встроенный FSM заменен StateSessionMiddleware: одно чтение и одна запись Redis на апдейт
+    dp = Dispatcher(bot=bot, storage=storage, deps=container, disable_fsm=True)
+    dp.fsm = StateSessionMiddleware(storage=storage, events_isolation=container.events_isolation())
+    dp.update.outer_middleware(dp.fsm)
+    # Хранилище закрывает обработчик, зарегистрированный самим Dispatcher (оно общее с замененным FSM),
+    # блокировку событий нового middleware закрываем сами
+    dp.shutdown.register(dp.fsm.events_isolation.close)
     dp.message.middleware(UserContextMiddleware())
     dp.callback_query.middleware(UserContextMiddleware())
 
@@ -68,6 +101,7 @@ async def main():
         subscription_router,
         teacher_router,
         lessons_router,
+        search_router,
         error_router,
     )
     dp.startup.register(on_startup)
@@ -1 +1,3 @@
 from .keyboard_data_store import KeyboardDataStore
+from .lesson_window_cache import LessonWindowCache
+from .snapshot_store import SnapshotStore, schema_version
@@ -0,0 +1,98 @@
+import time
+from datetime import date, timedelta
+from typing import Iterator
+
+from cachetools import LRUCache
+
+from dto import DateSpanDTO, LessonDTO
+from dto.base_dto import SubscriptableDTO
+
+# (resource_type, id) объекта расписания
+TargetKey = tuple[str, int]
+
+
+class LessonWindowCache:
+    """
+    Кеш уроков по объекту расписания (группа/преподаватель), проиндексированный по датам.
+
+    Любой поддиапазон уже загруженных дат отдается срезом без обращения к API,
+    загружать нужно только отсутствующие или устаревшие промежутки (см. missing_spans).
+    Объекты вытесняются по LRU, даты устаревают по TTL независимо друг от друга.
+
+    Промежутки загружаются в обход stale-while-revalidate сессии (AsyncClientSession.get_revalidated),
+    поэтому TTL дня отсчитывается от подтверждения данных сервером. Ранее полученные документы
+    ревалидируются по ETag (If-None-Match): повторный просмотр того же диапазона после истечения
+    TTL обычно обходится ответом 304 без тела.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        # target → {ISO-дата: (время загрузки, уроки за день)}
+        self._windows: LRUCache = LRUCache(maxsize=maxsize)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def _key(target: SubscriptableDTO) -> TargetKey:
+        return target.resource_type, target.id
+
+    @staticmethod
+    def _iter_dates(date_span: DateSpanDTO) -> Iterator[date]:
+        current = date_span.start
+        while current <= date_span.end:
+            yield current
+            current += timedelta(days=1)
+
+    def missing_spans(self, target: SubscriptableDTO, date_span: DateSpanDTO) -> list[DateSpanDTO]:
+        """Возвращает непрерывные промежутки дат, которых нет в кеше или которые устарели."""
+        window = self._windows.get(self._key(target), {})
+        expired_before = time.monotonic() - self.ttl
+
+        spans: list[DateSpanDTO] = []
+        gap_start = gap_end = None
+
+        for day in self._iter_dates(date_span):
+            entry = window.get(day.isoformat())
+            if entry is None or entry[0] < expired_before:
+                gap_start = gap_start or day
+                gap_end = day
+                continue
+            if gap_start is not None:
+                spans.append(DateSpanDTO(start=gap_start, end=gap_end))
+                gap_start = gap_end = None
+
+        if gap_start is not None:
+            spans.append(DateSpanDTO(start=gap_start, end=gap_end))
+
+        return spans
+
+    def store(self, target: SubscriptableDTO, date_span: DateSpanDTO, lessons: list[LessonDTO]) -> None:
+        """Сохраняет уроки загруженного промежутка. Дни без занятий тоже кешируются."""
+        key = self._key(target)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = {}
+
+        by_date: dict[str, list[LessonDTO]] = {}
+        for lesson in lessons:
+            by_date.setdefault(lesson.date, []).append(lesson)
+
+        loaded_at = time.monotonic()
+        for day in self._iter_dates(date_span):
+            day_str = day.isoformat()
+            window[day_str] = (loaded_at, tuple(by_date.get(day_str, ())))
+
+    def slice(self, target: SubscriptableDTO, date_span: DateSpanDTO) -> list[LessonDTO]:
+        """Возвращает уроки диапазона из кеша (без проверки свежести)."""
+        window = self._windows.get(self._key(target), {})
+        lessons: list[LessonDTO] = []
+        for day in self._iter_dates(date_span):
+            entry = window.get(day.isoformat())
+            if entry is not None:
+                lessons.extend(entry[1])
+        return lessons
+
+    def invalidate(self, target: SubscriptableDTO) -> None:
+        self._windows.pop(self._key(target), None)
@@ -0,0 +1,101 @@
+import logging
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from api_client.json_codec import JsonCodec
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EZSN"
+FORMAT_VERSION = 2  # 1 - pickle, не читается
+
+# magic, версия формата, версия данных, crc32 данных, длина данных
+_HEADER = struct.Struct("<4sHIIQ")
+
+
+def schema_version(*models: type[BaseModel]) -> int:
+    """
+    Версия данных по составу полей DTO: снимок, сохраненный до изменения DTO,
+    автоматически считается несовместимым.
+    """
+    schema = ";".join(
+        f"{model.__name__}:{','.join(f'{name}={field.annotation}' for name, field in model.model_fields.items())}"
+        for model in models
+    )
+    return zlib.crc32(schema.encode("utf-8"))
+
+
+class SnapshotStore:
+    """
+    Версионированный снимок данных справочника на диске.
+
+    Позволяет сервису стартовать с последними известными данными, не дожидаясь API.
+    Формат: заголовок (magic, версия формата, версия данных, crc32, длина) + JSON состояния.
+    JSON читается и пишется кодеком API-клиента (настройка api_json_codec): все кодеки дают
+    совместимый JSON, поэтому смена кодека не делает снимок непригодным.
+    Состояние - только данные (словари, списки, строки, числа): файл в каталоге снимков
+    не может выполнить код при загрузке, crc32 защищает лишь от повреждения, а не от подмены.
+    Индексы справочника хранятся в состоянии списками id, DTO и индексы из них собирает
+    сервис (см. services.directories, from_snapshot).
+
+    Снимок с другой версией, поврежденный или обрезанный игнорируется (как отсутствующий),
+    запись атомарна: данные пишутся во временный файл, который затем заменяет основной.
+    """
+
+    def __init__(self, file_path: str | Path, version: int, codec: Optional[JsonCodec] = None):
+        self.file_path = Path(file_path)
+        self.version = version
+        self.codec = codec or JsonCodec()
+
+    def load(self) -> Optional[Any]:
+        """Возвращает состояние из снимка или None, если снимка нет или он непригоден."""
+        try:
+            if not self.file_path.exists():
+                return None
+            raw = self.file_path.read_bytes()
+        except OSError as e:
+            logger.error(f"Failed to load snapshot from {self.file_path}: {str(e)}")
+            return None
+
+        if len(raw) < _HEADER.size:
+            logger.warning(f"Snapshot {self.file_path} is truncated, ignored")
+            return None
+
+        magic, format_version, version, checksum, length = _HEADER.unpack_from(raw)
+        if magic != MAGIC or format_version != FORMAT_VERSION or version != self.version:
+            logger.warning(f"Snapshot {self.file_path} has unsupported format, ignored")
+            return None
+
+        payload = raw[_HEADER.size:]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            logger.warning(f"Snapshot {self.file_path} is corrupted, ignored")
+            return None
+
+        try:
+            return self.codec.loads(payload)
+        except Exception as e:  # у кодеков свои исключения (msgspec.DecodeError - не ValueError)
+            logger.error(f"Failed to decode snapshot {self.file_path}: {str(e)}")
+            return None
+
+    def save(self, state: Any) -> bool:
+        """Атомарно сохраняет состояние, возвращает статус успеха."""
+        try:
+            payload = self.codec.dumps(state)
+            header = _HEADER.pack(MAGIC, FORMAT_VERSION, self.version, zlib.crc32(payload), len(payload))
+
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.file_path.with_suffix(".tmp")
+            with open(temp_file, "wb") as f:
+                f.write(header)
+                f.write(payload)
+
+            temp_file.replace(self.file_path)
+            logger.info(f"Snapshot saved to {self.file_path}.")
+            return True
+        except Exception as e:  # OSError и ошибки кодирования, у кодеков свои исключения
+            logger.error(f"Failed to save snapshot to {self.file_path}: {str(e)}")
+            return False
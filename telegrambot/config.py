@@ -16,17 +16,48 @@ class Settings(BaseSettings):
     storage_data_ttl: int
     platform: str = "telegram"
 
-    base_link: str = Field(alias="base_scraping_url")
+    # Пул соединений API-клиента
+    api_pool_limit: int = 100
+    api_pool_limit_per_host: int = 0
+    api_keepalive_timeout: float = 15
+    api_dns_cache_ttl: int = 300
+    api_connect_timeout: float = 5
+    api_read_timeout: float = 30
 
-    groups_cache_file_path: str = str(BASE_DIR / "cache" / "groups.json")
-    teachers_cache_file_path: str = str(BASE_DIR / "cache" / "teachers.json")
-    update_keyboards_rule: dict = {
-        "trigger": "cron",
-        "hour": 3,
-        "minute": 0,
-        "timezone": "Europe/Moscow",
+    # Stale-while-revalidate по типу ресурса (сек). Не указанные типы ревалидируются при каждом запросе
+    api_revalidation_policies: dict = {
+        "lessons": {"soft_ttl": 60, "hard_ttl": 600},
+        "groups": {"soft_ttl": 300, "hard_ttl": 600},
+        "teachers": {"soft_ttl": 300, "hard_ttl": 600},
     }
 
+    # Бюджеты кешей API-клиента в байтах исходного JSON (на каждый из трех кешей).
+    # В памяти разобранные документы занимают в несколько раз больше, см. CacheConfig
+    api_cache_public_bytes: int = 16 * 1024 * 1024
+    api_cache_user_bytes: int = 256 * 1024
+    api_cache_max_users: int = 2_000
+    api_cache_ttl: float = 600
+    api_lazy_documents: bool = False    # Создавать ResourceObject документа только при обращении к ним
+    api_fast_decode: bool = False       # Справочники и занятия разбираются из JSON напрямую в DTO (включает ленивые документы)
+    api_json_codec: str = "json"        # json, orjson, msgspec или auto (самый быстрый из установленных)
+
+    base_link: str = Field(alias="base_scraping_url")
+
+    groups_cache_file_path: str = str(BASE_DIR / "cache" / "groups.bin")
+    teachers_cache_file_path: str = str(BASE_DIR / "cache" / "teachers.bin")
+
+    lessons_cache_maxsize: int = 1000   # Кол-во групп/преподавателей в кеше расписаний
+    lessons_cache_ttl: int = 300        # Время жизни загруженного дня расписания (сек), 0 - без кеша
+    lessons_prefetch_enabled: bool = False  # Фоновая загрузка соседних страниц расписания
+    lessons_prefetch_concurrency: int = 4   # Глобальный лимит одновременных фоновых загрузок
+
+    fsm_l1_cache_maxsize: int = 0       # Записей FSM в локальном кеше перед Redis, 0 - без кеша
+    fsm_events_isolation: str = "local"  # Блокировка апдейтов пользователя: local (один процесс) или redis
+    keyboards_prebuild: bool = True     # Собирать все клавиатуры справочников сразу после обновления
+    update_keyboards_rule: dict = {"trigger": "interval", "minutes": 5}
+
+    stats_log_rule: dict = {"trigger": "interval", "minutes": 5}
+
     log_level: str = "INFO"
     project_name: str = "TelegramBot"
 
@@ -1,13 +1,15 @@
+import operator
+
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.redis import RedisStorage
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dependency_injector import containers, providers
 
-from api_client import AsyncClientSession, models_as_jsonschema
+from api_client import AsyncClientSession, CacheConfig, ConnectionPoolConfig, get_codec, models_as_jsonschema
 from dependencies.repositories import Repositories
 from dependencies.services import Services
+from state_session import L1CachedRedisStorage, create_events_isolation
 
 
 class Deps(containers.DeclarativeContainer):
@@ -25,7 +27,27 @@ class Deps(containers.DeclarativeContainer):
         server_url=config.api_base_url,
         hmac_secret=config.hmac_secret,
         platform=config.platform,
-        schema=models_as_jsonschema
+        schema=models_as_jsonschema,
+        pool_config=providers.Factory(
+            ConnectionPoolConfig,
+            limit=config.api_pool_limit,
+            limit_per_host=config.api_pool_limit_per_host,
+            keepalive_timeout=config.api_keepalive_timeout,
+            dns_cache_ttl=config.api_dns_cache_ttl,
+            connect_timeout=config.api_connect_timeout,
+            read_timeout=config.api_read_timeout,
+        ),
+        revalidation_policies=config.api_revalidation_policies,
+        cache_config=providers.Factory(
+            CacheConfig,
+            public_bytes=config.api_cache_public_bytes,
+            user_bytes=config.api_cache_user_bytes,
+            max_users=config.api_cache_max_users,
+            ttl=config.api_cache_ttl,
+        ),
+        # Быстрым декодерам нужен исходный JSON, который хранят только ленивые документы
+        lazy_documents=providers.Callable(operator.or_, config.api_lazy_documents, config.api_fast_decode),
+        json_codec=providers.Callable(get_codec, config.api_json_codec),
     )
 
     bot = providers.Singleton(
@@ -36,10 +58,18 @@ class Deps(containers.DeclarativeContainer):
 
     # Redis хранилище (применяется для FSM)
     storage = providers.Singleton(
-        RedisStorage.from_url,
+        L1CachedRedisStorage.from_url,
         url=config.redis_storage_url,
         state_ttl=config.storage_state_ttl,
         data_ttl=config.storage_data_ttl,
+        l1_maxsize=config.fsm_l1_cache_maxsize,
+    )
+
+    # Последовательная обработка апдейтов одного пользователя (FSM)
+    events_isolation = providers.Singleton(
+        create_events_isolation,
+        storage=storage,
+        kind=config.fsm_events_isolation,
     )
 
     # Планировщик периодических задач
@@ -51,4 +81,4 @@ class Deps(containers.DeclarativeContainer):
         api_client=api_client
     )
 
-    services = providers.Container(Services)
+    services = providers.Container(Services, config=config)
@@ -11,15 +11,7 @@ class Repositories(containers.DeclarativeContainer):
 
     account = providers.Singleton(JsonApiAccountRepository, api_client=api_client)
     user = providers.Singleton(JsonApiUserRepository, api_client=api_client)
-    group = providers.Singleton(
-        JsonApiGroupRepository,
-        api_client=api_client,
-        cache_file_path=config.groups_cache_file_path
-    )
-    teacher = providers.Singleton(
-        JsonApiTeacherRepository,
-        api_client=api_client,
-        cache_file_path=config.teachers_cache_file_path
-    )
+    group = providers.Singleton(JsonApiGroupRepository, api_client=api_client, fast_decode=config.api_fast_decode)
+    teacher = providers.Singleton(JsonApiTeacherRepository, api_client=api_client, fast_decode=config.api_fast_decode)
     subscription = providers.Singleton(JsonApiSubscriptionRepository, api_client=api_client)
-    lesson = providers.Singleton(JsonApiLessonRepository, api_client=api_client)
+    lesson = providers.Singleton(JsonApiLessonRepository, api_client=api_client, fast_decode=config.api_fast_decode)
@@ -1,11 +1,32 @@
 from dependency_injector import containers, providers
 
-from services import GroupService, LessonService, SubscriptionService, TeacherService, UserService
+from api_client import get_codec
+
+from services import GroupService, LessonService, SearchService, SubscriptionService, TeacherService, UserService
 
 
 class Services(containers.DeclarativeContainer):
+    config = providers.Configuration()
+
+    json_codec = providers.Singleton(get_codec, config.api_json_codec)
+
     user = providers.Factory(UserService)
-    teacher = providers.Singleton(TeacherService)
-    group = providers.Singleton(GroupService)
+    teacher = providers.Singleton(
+        TeacherService,
+        snapshot_path=config.teachers_cache_file_path,
+        json_codec=json_codec,
+    )
+    group = providers.Singleton(
+        GroupService,
+        snapshot_path=config.groups_cache_file_path,
+        json_codec=json_codec,
+    )
+    search = providers.Singleton(SearchService)
     subscription = providers.Factory(SubscriptionService)
-    lesson = providers.Factory(LessonService)
+    lesson = providers.Singleton(
+        LessonService,
+        cache_maxsize=config.lessons_cache_maxsize,
+        cache_ttl=config.lessons_cache_ttl,
+        prefetch_enabled=config.lessons_prefetch_enabled,
+        prefetch_concurrency=config.lessons_prefetch_concurrency,
+    )
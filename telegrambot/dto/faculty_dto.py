@@ -21,3 +21,13 @@ class FacultyDTO(BaseModel):
             title=f.title,
             short_title=f.short_title,
         )
+
+    @classmethod
+    def from_json(cls, f: dict) -> "FacultyDTO":
+        """Из объекта ресурса исходного JSON:API документа, без ResourceObject."""
+        attributes = f["attributes"]
+        return cls(
+            id=int(f["id"]),
+            title=attributes["title"],
+            short_title=attributes["shortTitle"],
+        )
@@ -38,4 +38,17 @@ class GroupDTO(SubscriptableDTO):
             faculty=faculty
         )
 
+    @classmethod
+    def from_json(cls, g: dict, faculty: Optional[FacultyDTO] = None) -> "GroupDTO":
+        """Из объекта ресурса исходного JSON:API документа, без ResourceObject."""
+        attributes = g["attributes"]
+        return cls(
+            id=int(g["id"]),
+            title=attributes["title"],
+            grade=int(attributes["grade"]),
+            link=attributes.get("link"),
+            faculty_id=int(g["relationships"]["faculty"]["data"]["id"]),
+            faculty=faculty,
+        )
+
 
@@ -1,3 +1,4 @@
+from sys import intern
 from typing import Optional
 
 from pydantic import BaseModel
@@ -49,3 +50,28 @@ class LessonDTO(BaseModel):
             _teacher_id=int(l.teacher._resource_identifier.id),
             teacher=teacher,
         )
+
+    @classmethod
+    def from_json(
+            cls,
+            l: dict,
+            group: Optional[GroupDTO] = None,
+            teacher: Optional[TeacherDTO] = None,
+    ) -> "LessonDTO":
+        """
+        Из объекта ресурса исходного JSON:API документа, без ResourceObject.
+        Строки интернируются: даты, время, предметы и аудитории повторяются из занятия в занятие.
+        """
+        attributes = l["attributes"]
+        return cls(
+            id=int(l["id"]),
+            number=int(attributes["number"]),
+            date=intern(attributes["date"]),
+            startTime=intern(attributes["startTime"]),
+            endTime=intern(attributes["endTime"]),
+            subject=intern(attributes["subject"]),
+            classroom=intern(attributes["classroom"]),
+            subgroup=intern(attributes["subgroup"]),
+            group=group,
+            teacher=teacher,
+        )
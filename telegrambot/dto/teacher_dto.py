@@ -32,3 +32,14 @@ class TeacherDTO(SubscriptableDTO):
             short_name=t.short_name,
             link=getattr(t, "link", None),
         )
+
+    @classmethod
+    def from_json(cls, t: dict) -> "TeacherDTO":
+        """Из объекта ресурса исходного JSON:API документа, без ResourceObject."""
+        attributes = t["attributes"]
+        return cls(
+            id=int(t["id"]),
+            full_name=attributes["fullName"],
+            short_name=attributes["shortName"],
+            link=attributes.get("link"),
+        )
@@ -4,6 +4,7 @@ from .group_handlers import router as faculty_router
 from .lessons_handlers import router as lessons_router
 from .main_handler import router as main_router
 from .navigation_handlers import router as navigation_router
+from .search_handlers import router as search_router
 from .start_handler import router as start_router
 from .subscription_handlers import router as subscription_router
 from .teacher_handlers import router as teacher_router
@@ -30,11 +30,9 @@ async def faculties_handler(
     """
     await state.update_data(branch=Branch.GROUPS)
 
-    faculties = group_service.get_faculties()
-
     await callback.message.edit_text(
         text=MessageManager.FACULTY_CHOOSING,
-        reply_markup=KeyboardManager.get_faculties_keyboard(faculties),
+        reply_markup=KeyboardManager.get_faculties_keyboard(group_service.directory),
     )
     await state.set_state(GroupStates.choosing_faculty)
     await callback.answer()
@@ -56,11 +54,10 @@ async def faculty_grades_handler(
     await state.update_data(faculty_id=faculty_id)
 
     faculty = group_service.get_faculty(faculty_id)
-    grades = group_service.get_grades_for_faculty(faculty_id)
 
     await callback.message.edit_text(
         text=MessageManager.get_grade_choosing_msg(faculty),
-        reply_markup=KeyboardManager.get_grades_keyboard(grades),
+        reply_markup=KeyboardManager.get_grades_keyboard(group_service.directory, faculty_id),
     )
     await state.set_state(GroupStates.choosing_grade)
     await callback.answer()
@@ -76,20 +73,19 @@ async def course_groups_handler(
 ):
     """
     Третий уровень навигации групп.
-    Ответ - клавиатура с группами выбранного факультета и курса.
+    Ответ - страница клавиатуры с группами выбранного факультета и курса.
     """
     data = await get_state_data(state, required_keys=("faculty_id",))
     faculty_id = data["faculty_id"]
 
-    chosen_grade = callback_data.grade
-    await state.update_data(grade=chosen_grade)
+    chosen_grade, page = callback_data.grade, callback_data.page
+    await state.update_data(grade=chosen_grade, page=page)
 
     faculty = group_service.get_faculty(faculty_id)
-    groups = group_service.get_groups_for_faculty_grade(faculty_id, chosen_grade)
 
     await callback.message.edit_text(
         text=MessageManager.get_group_choosing_msg(faculty, chosen_grade),
-        reply_markup=KeyboardManager.get_groups_keyboard(groups),
+        reply_markup=KeyboardManager.get_groups_keyboard(group_service.directory, faculty_id, chosen_grade, page),
     )
     await state.set_state(GroupStates.choosing_group)
     await callback.answer()
@@ -49,6 +49,7 @@ async def lessons_handler(
         reply_markup=KeyboardManager.get_schedule_keyboard(callback_data, prev_page, next_page),
     )
     await callback.answer()
+    lesson_service.schedule_prefetch(target_object, *mode.get_adjacent_spans(shift=shift))
 
 
 @router.callback_query(LessonsCallback.filter(F.source == EntitySource.CONTEXT))
@@ -92,3 +93,4 @@ async def context_lessons_handler(
     )
     await state.set_state(ActionStates.reading_schedule)
     await callback.answer()
+    lesson_service.schedule_prefetch(target_object, *mode.get_adjacent_spans(shift=shift))
@@ -43,7 +43,7 @@ async def back_handler(
                 # Возврат от выбора действия к выбору преподавателя
                 case ActionStates.choosing_action.state:
                     letter = data.get("letter")
-                    fake_callback_data = AlphabetCallback(letter=letter)
+                    fake_callback_data = AlphabetCallback(letter=letter, page=data.get("page", 0))
                     await teachers_bucket_handler(callback, fake_callback_data, state)
                     return
 
@@ -69,7 +69,7 @@ async def back_handler(
                 # Возврат от выбора действия к выбору группы
                 case ActionStates.choosing_action.state:
                     grade = data.get("grade")
-                    fake_callback_data = GradeCallback(grade=grade)
+                    fake_callback_data = GradeCallback(grade=grade, page=data.get("page", 0))
                     await course_groups_handler(callback, fake_callback_data, state)
                     return
 
@@ -0,0 +1,127 @@
+import logging
+
+from aiogram import F, Router, types
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from dependency_injector.wiring import inject, Provide
+
+from dependencies import Deps
+from dto import GroupDTO, TeacherDTO
+from dto.base_dto import SubscriptableDTO
+from enums import Branch
+from handlers.entity_handler import entity_handler
+from managers import KeyboardManager, MessageManager
+from managers.button_manager import EntityCallback, SearchCallback
+from services import GroupService, SearchService, SubscriptionService, TeacherService
+from services.directories import TeacherDirectory
+from states import BUTTON_ONLY_STATES, ActionStates
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+INLINE_RESULTS_LIMIT = 20
+INLINE_CACHE_TIME = 300  # сек, справочники меняются редко
+
+
+def get_navigation_data(
+        obj: SubscriptableDTO,
+        group_service: GroupService,
+        teacher_service: TeacherService,
+) -> dict:
+    """
+    Контекст FSM, как если бы объект был выбран через клавиатуры справочников:
+    кнопка "Назад" после поиска ведет на страницу с этим объектом.
+    """
+    if isinstance(obj, TeacherDTO):
+        letter = TeacherDirectory.letter_of(obj)
+        bucket = teacher_service.get_teachers(letter)
+        return {"branch": Branch.TEACHERS, "obj_id": obj.id, "letter": letter,
+                "page": KeyboardManager.page_of(bucket, obj)}
+
+    bucket = group_service.get_groups_for_faculty_grade(obj.faculty_id, obj.grade)
+    return {"branch": Branch.GROUPS, "obj_id": obj.id, "faculty_id": obj.faculty_id, "grade": obj.grade,
+            "page": KeyboardManager.page_of(bucket, obj)}
+
+
+@router.message(F.text, ~F.text.startswith("/"), StateFilter(*BUTTON_ONLY_STATES))
+@inject
+async def search_handler(
+        message: types.Message,
+        state: FSMContext,
+        search_service: SearchService = Provide[Deps.services.search],
+        group_service: GroupService = Provide[Deps.services.group],
+        teacher_service: TeacherService = Provide[Deps.services.teacher],
+        subscription_service: SubscriptionService = Provide[Deps.services.subscription],
+):
+    """
+    Поиск по тексту сообщения.
+    Точное совпадение (в том числе выбранный inline-результат) сразу открывает объект,
+    иначе - клавиатура с результатами.
+    """
+    query = message.text
+    exact = search_service.find_exact(query)
+
+    if len(exact) == 1:
+        obj = exact[0]
+        await state.update_data(get_navigation_data(obj, group_service, teacher_service))
+        subscription = await subscription_service.get_subscription_by_target(obj)
+        await message.answer(
+            text=MessageManager.get_selected_msg(obj, subscription),
+            reply_markup=KeyboardManager.get_actions_keyboard(obj, subscription),
+        )
+        await state.set_state(ActionStates.choosing_action)
+        return
+
+    results = exact or search_service.search(query)
+    await message.answer(
+        text=MessageManager.get_search_results_msg(query, results),
+        reply_markup=KeyboardManager.get_search_keyboard(results),
+    )
+
+
+@router.callback_query(SearchCallback.filter())
+@inject
+async def search_result_handler(
+        callback: types.CallbackQuery,
+        callback_data: SearchCallback,
+        state: FSMContext,
+        group_service: GroupService = Provide[Deps.services.group],
+        teacher_service: TeacherService = Provide[Deps.services.teacher],
+):
+    """Выбор объекта из результатов поиска - дальше как при выборе через справочник."""
+    if callback_data.branch == Branch.TEACHERS:
+        obj = teacher_service.get_teacher(callback_data.id)
+    else:
+        obj = group_service.get_group(callback_data.id)
+
+    if obj is None:
+        await callback.answer(MessageManager.SEARCH_NOTHING_FOUND)
+        return
+
+    await state.update_data(get_navigation_data(obj, group_service, teacher_service))
+    await entity_handler(callback, EntityCallback(id=obj.id), state)
+
+
+@router.inline_query()
+@inject
+async def inline_search_handler(
+        inline_query: types.InlineQuery,
+        search_service: SearchService = Provide[Deps.services.search],
+):
+    """
+    Inline-поиск (кнопка "Поиск" главного меню).
+    Выбранный результат отправляет в чат точное название, которое открывает объект через search_handler.
+    """
+    results = search_service.search(inline_query.query, limit=INLINE_RESULTS_LIMIT)
+    await inline_query.answer(
+        results=[
+            types.InlineQueryResultArticle(
+                id=f"{Branch.GROUPS if isinstance(obj, GroupDTO) else Branch.TEACHERS}:{obj.id}",
+                title=obj.display_name,
+                description="Группа" if isinstance(obj, GroupDTO) else "Преподаватель",
+                input_message_content=types.InputTextMessageContent(message_text=obj.display_name),
+            )
+            for obj in results
+        ],
+        cache_time=INLINE_CACHE_TIME,
+    )
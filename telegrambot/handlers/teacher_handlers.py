@@ -28,11 +28,9 @@ async def alphabet_handler(
     """
     await state.update_data(branch=Branch.TEACHERS)
 
-    letters = teacher_service.get_letters()
-
     await callback.message.edit_text(
         text=MessageManager.LETTER_CHOOSING,
-        reply_markup=KeyboardManager.get_alphabet_keyboard(letters),
+        reply_markup=KeyboardManager.get_alphabet_keyboard(teacher_service.directory),
     )
     await state.set_state(TeacherStates.choosing_letter)
     await callback.answer()
@@ -48,16 +46,14 @@ async def teachers_bucket_handler(
 ):
     """
     Второй уровень навигации преподавателей.
-    Ответ - клавиатура с преподавателями на конкретную букву.
+    Ответ - страница клавиатуры с преподавателями на конкретную букву.
     """
-    letter = callback_data.letter
-    await state.update_data(letter=letter)
-
-    teachers = teacher_service.get_teachers(letter)
+    letter, page = callback_data.letter, callback_data.page
+    await state.update_data(letter=letter, page=page)
 
     await callback.message.edit_text(
         text=MessageManager.TEACHERS_CHOOSING,
-        reply_markup=KeyboardManager.get_teachers_keyboard(teachers),
+        reply_markup=KeyboardManager.get_teachers_keyboard(teacher_service.directory, letter, page),
     )
     await state.set_state(TeacherStates.choosing_teacher)
     await callback.answer()
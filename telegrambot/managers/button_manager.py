@@ -4,6 +4,7 @@ from typing import List, Optional
 
 from aiogram.filters.callback_data import CallbackData
 from aiogram.utils.keyboard import InlineKeyboardButton
+from pydantic import ConfigDict
 
 from config import settings
 from enums import NavigationAction, ModeEnum, SubscriptionAction
@@ -11,28 +12,82 @@ from enums import NavigationAction, ModeEnum, SubscriptionAction
 logger = logging.getLogger(__name__)
 
 
-class FacultyCallback(CallbackData, prefix="f"):
+class InternedCallback:
+    """
+    Примесь к CallbackData, переиспользующая упакованные строки и разобранные объекты.
+
+    Модель pydantic создается и валидируется один раз на значение, повторные
+    packed()/unpack() - поиск в LRU. Разобранные объекты общие для всех обработчиков,
+    поэтому модели неизменяемы.
+
+    Новые поля добавляются в конец и со значением по умолчанию: кнопки из ранее
+    отправленных сообщений приходят без них и разбираются со значениями по умолчанию.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    @classmethod
+    def packed(cls, *values) -> str:
+        """Строка callback_data по значениям полей в порядке объявления."""
+        return _pack(cls, values)
+
+    @classmethod
+    def unpack(cls, value: str):
+        # Чужой префикс отсекается без разбора: фильтры всех роутеров проверяют каждый callback
+        if not value.startswith(cls.__prefix__ + cls.__separator__):
+            raise ValueError(f"Bad prefix ({value!r} is not {cls.__prefix__!r})")
+        return _unpack(cls, value)
+
+
+# Исходящие значения перечислимы (факультеты, id справочников, сетка режимов расписания),
+# входящие ограничены LRU: callback_data приходит от клиента
+@lru_cache(maxsize=16_384)
+def _pack(cls: type[CallbackData], values: tuple) -> str:
+    return cls(**dict(zip(cls.__pydantic_fields__, values))).pack()
+
+
+@lru_cache(maxsize=4_096)
+def _unpack(cls: type[CallbackData], value: str) -> CallbackData:
+    fields = list(cls.__pydantic_fields__.values())
+    missing = len(fields) - value.count(cls.__separator__)
+    if 0 < missing < len(fields) and not any(field.is_required() for field in fields[-missing:]):
+        # Старый формат без дописанных полей ("grade:2" до пагинации): дописываем значения по умолчанию,
+        # пустая строка для None разбирается CallbackData обратно в None
+        value += "".join(
+            cls.__separator__ + ("" if field.default is None else str(field.default))
+            for field in fields[-missing:]
+        )
+    return CallbackData.unpack.__func__(cls, value)
+
+
+class FacultyCallback(InternedCallback, CallbackData, prefix="f"):
     faculty_id: int
 
 
-class GradeCallback(CallbackData, prefix="grade"):
+class GradeCallback(InternedCallback, CallbackData, prefix="grade"):
     grade: int
+    page: int = 0   # страница клавиатуры групп
 
 
-class AlphabetCallback(CallbackData, prefix="a"):
+class AlphabetCallback(InternedCallback, CallbackData, prefix="a"):
     letter: str
+    page: int = 0   # страница клавиатуры преподавателей
 
 
-class EntityCallback(CallbackData, prefix="e"):
+class EntityCallback(InternedCallback, CallbackData, prefix="e"):
     id: int
 
 
-class SubscriptionCallback(CallbackData, prefix="sub"):
+class SubscriptionCallback(InternedCallback, CallbackData, prefix="sub"):
     action: str  # subscribe, unsubscribe
     sub_id: Optional[int] = None
 
 
-class LessonsCallback(CallbackData, prefix="les"):
+class SearchCallback(InternedCallback, CallbackData, prefix="s"):
+    branch: str  # groups, teachers
+    id: int
+
+
+class LessonsCallback(InternedCallback, CallbackData, prefix="les"):
     source: str  # context, subscription
     mode: str  # today, tomorrow, ahead, week
     shift: int = 0
@@ -62,6 +117,7 @@ class Button:
     groups = InlineKeyboardButton(text="🎓Группы", callback_data=NavigationAction.FACULTIES)
     teachers = InlineKeyboardButton(text="👨‍🏫👩‍🏫Преподаватели", callback_data=NavigationAction.ALPHABET)
     site = InlineKeyboardButton(text="🌍Сайт", url=settings.base_link)
+    search = InlineKeyboardButton(text="🔎 Поиск", switch_inline_query_current_chat="")
 
     subscribe = InlineKeyboardButton(
         text="⭐ Подписаться",
@@ -72,7 +128,7 @@ class Button:
     def unsubscribe(sub_id: int | str) -> InlineKeyboardButton:
         return InlineKeyboardButton(
             text="✖️ Отписаться",
-            callback_data=SubscriptionCallback(action=SubscriptionAction.UNSUBSCRIBE, sub_id=sub_id).pack()
+            callback_data=SubscriptionCallback.packed(SubscriptionAction.UNSUBSCRIBE, sub_id)
         )
 
     @staticmethod
@@ -82,21 +138,21 @@ class Button:
             [
                 InlineKeyboardButton(
                     text="🗓 Сегодня",
-                    callback_data=LessonsCallback(source=source, mode=ModeEnum.ONE_DAY).pack(),
+                    callback_data=LessonsCallback.packed(source, ModeEnum.ONE_DAY, 0),
                 ),
                 InlineKeyboardButton(
                     text="🗓 Завтра",
-                    callback_data=LessonsCallback(source=source, mode=ModeEnum.ONE_DAY, shift=1).pack(),
+                    callback_data=LessonsCallback.packed(source, ModeEnum.ONE_DAY, 1),
                 ),
             ],
             [
                 InlineKeyboardButton(
                     text="🗓 На 3 дня",
-                    callback_data=LessonsCallback(source=source, mode=ModeEnum.THREE_DAYS).pack(),
+                    callback_data=LessonsCallback.packed(source, ModeEnum.THREE_DAYS, 0),
                 ),
                 InlineKeyboardButton(
                     text="🗓 Неделя",
-                    callback_data=LessonsCallback(source=source, mode=ModeEnum.WEEK).pack(),
+                    callback_data=LessonsCallback.packed(source, ModeEnum.WEEK, 0),
                 ),
             ],
         ]
@@ -112,7 +168,7 @@ class Button:
         """Создаёт кнопку курса с эмодзи."""
         return InlineKeyboardButton(
             text=f"\t\t{cls.replace_with_emojis(str(digit))}\t\t",
-            callback_data=GradeCallback(grade=digit).pack(),
+            callback_data=GradeCallback.packed(digit, 0),
         )
 
     @classmethod
@@ -120,7 +176,7 @@ class Button:
     def letter(cls, letter: str) -> InlineKeyboardButton:
         """Создаёт кнопку курса с эмодзи."""
         return InlineKeyboardButton(
-            text=f"\t\t{letter}\t\t", callback_data=AlphabetCallback(letter=letter).pack()
+            text=f"\t\t{letter}\t\t", callback_data=AlphabetCallback.packed(letter, 0)
         )
 
     @staticmethod
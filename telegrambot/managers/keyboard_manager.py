@@ -3,21 +3,38 @@ from typing import Optional
 
 from aiogram.utils.keyboard import (
     InlineKeyboardBuilder,
+    InlineKeyboardButton,
     InlineKeyboardMarkup,
 )
+from cachetools import LRUCache, cached
 from cachetools.func import ttl_cache
+from cachetools.keys import hashkey
 
-from dto import FacultyDTO, GroupDTO, SubscriptionDTO, TeacherDTO
+from dto import GroupDTO, SubscriptionDTO
 from dto.subscription_dto import SubscriptableDTO
-from enums import EntitySource
-from managers.button_manager import Button, EntityCallback, FacultyCallback, LessonsCallback
+from enums import Branch, EntitySource
+from managers.button_manager import (
+    AlphabetCallback,
+    Button,
+    EntityCallback,
+    FacultyCallback,
+    GradeCallback,
+    LessonsCallback,
+    SearchCallback,
+)
+from schedule_view_modes import ScheduleMode
+from services.directories import GroupDirectory, TeacherDirectory
 
 logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 86400  # 24 часа
 GROUP_KEYBOARD_ROW_WIDTH = 3
+TEACHER_KEYBOARD_ROW_WIDTH = 2
 ALPHABET_KEYBOARD_ROW_WIDTH = 5
 FACULTIES_KEYBOARD_ROW_WIDTH = 3
+# Кнопок справочника на одной странице: Telegram ограничивает клавиатуру 100 кнопками,
+# а небольшая страница - это небольшой payload edit_text при любом размере справочника
+DIRECTORY_PAGE_SIZE = 30
 
 
 class KeyboardManager:
@@ -25,7 +42,7 @@ class KeyboardManager:
     back_home = InlineKeyboardMarkup(inline_keyboard=[[Button.back, Button.home]])
     main_base = InlineKeyboardMarkup(inline_keyboard=[
         [Button.groups, Button.teachers],
-        [Button.site]
+        [Button.search, Button.site]
     ])
 
     confirm = InlineKeyboardMarkup(inline_keyboard=[[Button.back, Button.confirm]])
@@ -45,90 +62,173 @@ class KeyboardManager:
         builder.row(Button.groups, Button.teachers)
 
         if endpoint is not None:
-            builder.row(Button.page_link(endpoint))
+            builder.row(Button.search, Button.page_link(endpoint))
         else:
-            builder.row(Button.site)
+            builder.row(Button.search, Button.site)
 
         return builder.as_markup()
 
+    # Клавиатуры справочников кешируются по версии своего раздела справочника: ключ не зависит
+    # от размера данных, а при обновлении пересобираются только клавиатуры измененных разделов
+    # (см. services.directories).
+
     @staticmethod
-    @ttl_cache(maxsize=1, ttl=60 * 20)
-    def get_faculties_keyboard(faculties: tuple[FacultyDTO, ...]) -> InlineKeyboardMarkup:
-        """Собирает клавиатуру факультетов из кэша."""
+    @cached(LRUCache(maxsize=4), key=lambda directory: hashkey(directory.section_version("faculties")))
+    def get_faculties_keyboard(directory: GroupDirectory) -> InlineKeyboardMarkup:
+        """Собирает клавиатуру факультетов."""
+        faculties = directory.faculties
         builder = InlineKeyboardBuilder()
-        for faculty in faculties:
-            builder.button(
-                text=faculty.button_name,
-                callback_data=FacultyCallback(faculty_id=faculty.id).pack(),
-            )
+        # Кнопки добавляются одним вызовом: каждый add/button копирует всю разметку
+        builder.add(*(
+            InlineKeyboardButton(text=faculty.button_name, callback_data=FacultyCallback.packed(faculty.id))
+            for faculty in faculties
+        ))
         if faculties:
             builder.adjust(FACULTIES_KEYBOARD_ROW_WIDTH)  # до 3 факультетов в строке
         builder.row(Button.back_home, Button.home)
         return builder.as_markup()
 
     @staticmethod
-    @ttl_cache(maxsize=128, ttl=60 * 10)
-    def get_grades_keyboard(grades: tuple[int, ...]) -> InlineKeyboardMarkup:
+    @cached(
+        LRUCache(maxsize=256),
+        key=lambda directory, faculty_id: hashkey(directory.section_version("grades", faculty_id), faculty_id),
+    )
+    def get_grades_keyboard(directory: GroupDirectory, faculty_id: int) -> InlineKeyboardMarkup:
         """
         Клавиатура курсов для выбранного факультета
         """
         builder = InlineKeyboardBuilder()
 
-        for grade in grades:
-            builder.add(Button.grade(grade))
+        builder.add(*map(Button.grade, directory.grades_by_faculty.get(faculty_id, ())))
 
         builder.row(Button.back, Button.home)
         return builder.as_markup()
 
     @staticmethod
-    @ttl_cache(maxsize=128, ttl=60 * 10)
-    def get_groups_keyboard(groups: tuple[GroupDTO, ...]) -> InlineKeyboardMarkup:
-        """Собирает клавиатуру групп для выбранного факультета и курса."""
-        builder = InlineKeyboardBuilder()
+    def page_count(items: tuple) -> int:
+        """Число страниц клавиатуры справочника (не меньше одной)."""
+        return max(1, -(-len(items) // DIRECTORY_PAGE_SIZE))
 
-        for group in groups:
-            builder.button(
-                text=group.button_name,
-                callback_data=EntityCallback(id=group.id).pack(),
-            )
+    @staticmethod
+    def page_of(items: tuple, item) -> int:
+        """Номер страницы клавиатуры справочника, на которой находится item."""
+        return items.index(item) // DIRECTORY_PAGE_SIZE if item in items else 0
 
-        if groups:
-            builder.adjust(GROUP_KEYBOARD_ROW_WIDTH)  # до 2 групп в строке
+    @classmethod
+    def _paginate(cls, builder: InlineKeyboardBuilder, items: tuple, page: int, row_width: int, page_callback) -> None:
+        """Добавляет кнопки страницы page и строку листания; page_callback(page) - callback_data страницы."""
+        pages = cls.page_count(items)
+        # Страница из старого сообщения могла исчезнуть, если справочник с тех пор сократился
+        page = min(max(page, 0), pages - 1)
+        page_items = items[page * DIRECTORY_PAGE_SIZE:(page + 1) * DIRECTORY_PAGE_SIZE]
+        builder.add(*(
+            InlineKeyboardButton(text=item.button_name, callback_data=EntityCallback.packed(item.id))
+            for item in page_items
+        ))
+        if page_items:
+            builder.adjust(row_width)
+
+        navigation = []
+        if page > 0:
+            navigation.append(InlineKeyboardButton(text=f"◀️ {page}/{pages}", callback_data=page_callback(page - 1)))
+        if page < pages - 1:
+            navigation.append(InlineKeyboardButton(text=f"{page + 2}/{pages} ▶️", callback_data=page_callback(page + 1)))
+        if navigation:
+            builder.row(*navigation)
 
+    @classmethod
+    @cached(
+        LRUCache(maxsize=1024),
+        key=lambda cls, directory, faculty_id, grade, page=0: hashkey(
+            directory.section_version("groups", faculty_id, grade), faculty_id, grade, page
+        ),
+    )
+    def get_groups_keyboard(
+            cls,
+            directory: GroupDirectory,
+            faculty_id: int,
+            grade: int,
+            page: int = 0,
+    ) -> InlineKeyboardMarkup:
+        """Собирает страницу клавиатуры групп для выбранного факультета и курса."""
+        groups = directory.groups_by_faculty_grade.get((faculty_id, grade), ())
+        builder = InlineKeyboardBuilder()
+        cls._paginate(
+            builder, groups, page, GROUP_KEYBOARD_ROW_WIDTH,  # до 3 групп в строке
+            lambda p: GradeCallback.packed(grade, p),
+        )
         builder.row(Button.back, Button.home)
         return builder.as_markup()
 
     @staticmethod
-    @ttl_cache(maxsize=1, ttl=60 * 20)
-    def get_alphabet_keyboard(letters: tuple[str, ...]) -> InlineKeyboardMarkup:
-        """Собирает клавиатуру с буквами алфавита из teachers_cache."""
+    @cached(LRUCache(maxsize=4), key=lambda directory: hashkey(directory.section_version("letters")))
+    def get_alphabet_keyboard(directory: TeacherDirectory) -> InlineKeyboardMarkup:
+        """Собирает клавиатуру с буквами алфавита."""
+        letters = directory.letters
         builder = InlineKeyboardBuilder()
 
-        for letter in letters:
-            builder.add(Button.letter(letter))
+        builder.add(*map(Button.letter, letters))
 
         if letters:
             builder.adjust(ALPHABET_KEYBOARD_ROW_WIDTH)  # 5 букв в строке
         builder.row(Button.back_home, Button.home)
         return builder.as_markup()
 
-    @staticmethod
-    @ttl_cache(maxsize=33, ttl=60 * 10)
-    def get_teachers_keyboard(teachers: tuple[TeacherDTO, ...]) -> InlineKeyboardMarkup:
-        """Собирает клавиатуру учителей для выбранной буквы."""
+    @classmethod
+    @cached(
+        LRUCache(maxsize=512),
+        key=lambda cls, directory, letter, page=0: hashkey(directory.section_version("teachers", letter), letter, page),
+    )
+    def get_teachers_keyboard(cls, directory: TeacherDirectory, letter: str, page: int = 0) -> InlineKeyboardMarkup:
+        """Собирает страницу клавиатуры учителей для выбранной буквы."""
+        teachers = directory.teachers_by_bucket.get(letter, ())
         builder = InlineKeyboardBuilder()
+        cls._paginate(
+            builder, teachers, page, TEACHER_KEYBOARD_ROW_WIDTH,
+            lambda p: AlphabetCallback.packed(letter, p),
+        )
+        builder.row(Button.back, Button.home)
+        return builder.as_markup()
 
-        for teacher in teachers:
-            builder.button(
-                text=teacher.button_name,
-                callback_data=EntityCallback(id=teacher.id).pack(),
-            )
+    @classmethod
+    def prebuild(cls, groups: GroupDirectory, teachers: TeacherDirectory) -> int:
+        """Заранее собирает все клавиатуры справочников текущих версий. Возвращает число собранных."""
+        builds = [
+            (cls.get_faculties_keyboard, (groups,)),
+            *((cls.get_grades_keyboard, (groups, faculty_id)) for faculty_id in groups.grades_by_faculty),
+            *(
+                (cls.get_groups_keyboard, (groups, *key, page))
+                for key, bucket in groups.groups_by_faculty_grade.items()
+                for page in range(cls.page_count(bucket))
+            ),
+            (cls.get_alphabet_keyboard, (teachers,)),
+            *(
+                (cls.get_teachers_keyboard, (teachers, letter, page))
+                for letter, bucket in teachers.teachers_by_bucket.items()
+                for page in range(cls.page_count(bucket))
+            ),
+        ]
+
+        built = 0
+        for build, args in builds:
+            try:
+                build(*args)
+                built += 1
+            except ValueError as e:
+                logger.warning(f"Failed to prebuild keyboard {build.__name__}{args[1:]}: {e}")
+        return built
 
-        # TODO: Такое вычисление количества кнопок в строке потенциально опасное
-        #  Элементов в teachers в теории может оказаться слишком много.
-        row_width = len(teachers) // 10 + 1
-        builder.adjust(row_width)
-        builder.row(Button.back, Button.home)
+    @staticmethod
+    def get_search_keyboard(results: list[SubscriptableDTO]) -> InlineKeyboardMarkup:
+        """Клавиатура результатов поиска: по одной группе или преподавателю в строке."""
+        builder = InlineKeyboardBuilder()
+        for obj in results:
+            icon, branch = ("🎓", Branch.GROUPS) if isinstance(obj, GroupDTO) else ("👨‍🏫", Branch.TEACHERS)
+            builder.row(InlineKeyboardButton(
+                text=f"{icon} {obj.display_name}",
+                callback_data=SearchCallback.packed(branch, obj.id),
+            ))
+        builder.row(Button.home)
         return builder.as_markup()
 
     @classmethod
@@ -155,6 +255,12 @@ class KeyboardManager:
         return builder.as_markup()
 
     @classmethod
+    @cached(
+        LRUCache(maxsize=1024),
+        key=lambda cls, callback_data, prev_page, next_page: hashkey(
+            callback_data.source, callback_data.mode, callback_data.shift, prev_page, next_page
+        ),
+    )
     def get_schedule_keyboard(
             cls,
             callback_data: LessonsCallback,
@@ -166,21 +272,15 @@ class KeyboardManager:
         source, mode, shift = callback_data.source, callback_data.mode, callback_data.shift
 
         if prev_page is not None:
-            builder.button(
-                text="◀️",
-                callback_data=LessonsCallback(source=source, mode=mode, shift=prev_page).pack(),
-            )
+            builder.button(text="◀️", callback_data=LessonsCallback.packed(source, mode, prev_page))
 
         builder.button(
             text="🔄 Обновить" if shift == 0 else "🔄 Сегодня",
-            callback_data=LessonsCallback(source=source, mode=mode).pack(),
+            callback_data=LessonsCallback.packed(source, mode, 0),
         )
 
         if next_page is not None:
-            builder.button(
-                text="▶️",
-                callback_data=LessonsCallback(source=source, mode=mode, shift=next_page).pack()
-            )
+            builder.button(text="▶️", callback_data=LessonsCallback.packed(source, mode, next_page))
 
         builder.adjust(3)
 
@@ -190,3 +290,19 @@ class KeyboardManager:
             builder.row(Button.back, Button.home)
 
         return builder.as_markup()
+
+    @classmethod
+    def prebuild_schedule_keyboards(cls) -> int:
+        """
+        Заранее собирает клавиатуры листания расписания для всей сетки (источник, режим, сдвиг).
+        Сетка ограничена max_back_shift/max_forward_shift режимов, возвращает число клавиатур.
+        """
+        built = 0
+        for mode in ScheduleMode.modes():
+            for shift in range(-mode.max_back_shift, mode.max_forward_shift + 1):
+                for source in EntitySource:
+                    cls.get_schedule_keyboard(
+                        LessonsCallback(source=source, mode=mode.name, shift=shift), *mode.get_page_range(shift)
+                    )
+                    built += 1
+        return built
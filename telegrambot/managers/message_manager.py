@@ -1,3 +1,4 @@
+import html
 import logging
 from datetime import date, timedelta
 from typing import Callable, Optional
@@ -129,6 +130,10 @@ class MessageManager:
     LETTER_CHOOSING = "Выберите букву:"
     TEACHERS_CHOOSING = "Выберите преподавателя:"
 
+    # === Поиск ===
+    _SEARCH_RESULTS = "🔎 Результаты по запросу «{query}»:"
+    SEARCH_NOTHING_FOUND = "🔎 Ничего не найдено. Введите название группы или фамилию преподавателя."
+
     # === Экран выбранного объекта (группа/преподаватель) ===
     _SELECTED_TEMPLATE = ("{label}:\n"
                           "<b>{display_name}</b>"
@@ -198,6 +203,13 @@ class MessageManager:
             faculty_title=faculty.title, grade=grade
         )
 
+    @classmethod
+    def get_search_results_msg(cls, query: str, results: list[SubscriptableDTO]) -> str:
+        """Сообщение с результатами поиска."""
+        if not results:
+            return cls.SEARCH_NOTHING_FOUND
+        return cls._SEARCH_RESULTS.format(query=html.escape(query))
+
     @classmethod
     def get_selected_msg(
             cls,
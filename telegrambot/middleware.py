@@ -1,9 +1,12 @@
 from aiogram import BaseMiddleware
+from aiogram.fsm.middleware import FSMContextMiddleware
+from aiogram.fsm.storage.base import DEFAULT_DESTINY, StorageKey
 from aiogram.types import TelegramObject
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from context import request_context
 
 from dependencies import Deps
+from state_session import StateSession
 
 
 class DependencyMiddleware(BaseMiddleware):
@@ -34,3 +37,58 @@ class UserContextMiddleware(BaseMiddleware):
             })
 
         return await handler(event, data)
+
+
+class StateSessionMiddleware(FSMContextMiddleware):
+    """
+    FSM-middleware, передающий обработчикам StateSession вместо FSMContext:
+    одно чтение состояния и данных на апдейт и одна запись изменений после обработчика.
+    Регистрируется вместо встроенного FSM диспетчера (Dispatcher(disable_fsm=True)),
+    events_isolation передается явно: с disable_fsm диспетчер подставляет DisabledEventIsolation.
+    """
+
+    def get_context(
+            self,
+            bot,
+            chat_id: int,
+            user_id: int,
+            thread_id: Optional[int] = None,
+            business_connection_id: Optional[str] = None,
+            destiny: str = DEFAULT_DESTINY,
+    ) -> StateSession:
+        return StateSession(
+            storage=self.storage,
+            key=StorageKey(
+                user_id=user_id,
+                chat_id=chat_id,
+                bot_id=bot.id,
+                thread_id=thread_id,
+                business_connection_id=business_connection_id,
+                destiny=destiny,
+            ),
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async def handle_and_flush(event: TelegramObject, data: Dict[str, Any]) -> Any:
+            try:
+                result = await handler(event, data)
+            except Exception:
+                # Изменения обработчика, упавшего на середине, не сохраняются: частично обновленное
+                # состояние хуже прежнего. Обработчики ошибок пишут свои изменения сразу
+                state = data.get("state")
+                if isinstance(state, StateSession):
+                    state.discard()
+                raise
+
+            # Запись до снятия блокировки events_isolation
+            state = data.get("state")
+            if isinstance(state, StateSession):
+                await state.flush()
+            return result
+
+        return await super().__call__(handle_and_flush, event, data)
@@ -1,8 +1,12 @@
+import asyncio
 from collections import defaultdict
+from typing import Iterable
 
+from jsonapi_client.objects import ResourceIdentifier
 from jsonapi_client.resourceobject import ResourceObject
 
 from api_client import AsyncClientSession
+from api_client.document import CustomDocument
 
 
 class JsonApiBaseRepository:
@@ -13,9 +17,69 @@ class JsonApiBaseRepository:
     def _separate_included_resources(document):
         if not getattr(document, "included", None):
             return {}
+        if isinstance(document, CustomDocument):
+            # Индекс документа: в ленивом режиме ресурсы создаются только для запрошенных id
+            return document.included_by_type()
 
         grouped: dict[str, dict[str, ResourceObject]] = defaultdict(dict)
         for resource in document.included:
             grouped[resource.type][resource.id] = resource
 
         return dict(grouped)
+
+    @staticmethod
+    def _get_related_identifier(resource: ResourceObject, rel_name: str) -> ResourceIdentifier | None:
+        """Возвращает идентификатор связанного ресурса без обращения к кешу и серверу."""
+        rel = getattr(resource, rel_name, None)
+        return getattr(rel, "_resource_identifier", None)
+
+    def _collect_missing_identifiers(
+            self,
+            resources: Iterable[ResourceObject],
+            rel_names: Iterable[str],
+            included: dict[str, dict[str, ResourceObject]],
+    ) -> dict[tuple[str, str], ResourceIdentifier]:
+        """Собирает идентификаторы связанных ресурсов, которых нет в секции included."""
+        missing: dict[tuple[str, str], ResourceIdentifier] = {}
+        for resource in resources:
+            for rel_name in rel_names:
+                identifier = self._get_related_identifier(resource, rel_name)
+                if identifier is None:
+                    continue
+                if identifier.id not in included.get(identifier.type, {}):
+                    missing[(identifier.type, identifier.id)] = identifier
+        return missing
+
+    async def _fetch_missing_resources(
+            self,
+            missing: dict[tuple[str, str], ResourceIdentifier],
+            included: dict[str, dict[str, ResourceObject]],
+    ) -> None:
+        """
+        Догружает отсутствующие связанные ресурсы одним конкурентным шагом
+        и дописывает их в индекс included.
+        """
+        if not missing:
+            return
+
+        fetched = await asyncio.gather(*(
+            self.api_client.fetch_resource_by_resource_identifier_async(identifier)
+            for identifier in missing.values()
+        ))
+        for resource in fetched:
+            included.setdefault(resource.type, {})[resource.id] = resource
+
+    async def _resolve_included_resources(
+            self,
+            document,
+            rel_names: Iterable[str],
+    ) -> dict[str, dict[str, ResourceObject]]:
+        """
+        Индексирует связанные ресурсы документа по (type, id) за один проход.
+        Ресурсы, которых нет в included, загружаются пакетно.
+        """
+        rel_names = tuple(rel_names)
+        included = self._separate_included_resources(document)
+        missing = self._collect_missing_identifiers(document.resources, rel_names, included)
+        await self._fetch_missing_resources(missing, included)
+        return included
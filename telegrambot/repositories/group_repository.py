@@ -1,14 +1,15 @@
 import logging
-from typing import List
-from pathlib import Path
+from typing import List, Optional
 
 
 from jsonapi_client import Inclusion
 from jsonapi_client.document import Document
 
 from api_client import AsyncClientSession
+from api_client.thunder_protection import thunder_protection
 from dto import GroupDTO
 from dto.faculty_dto import FacultyDTO
+from repositories.json_decoding import included_of_type, primary_resources
 
 logger = logging.getLogger(__name__)
 
@@ -16,21 +17,43 @@ logger = logging.getLogger(__name__)
 class JsonApiGroupRepository:
     resource_name = "groups"
 
-    def __init__(self, api_client: AsyncClientSession, cache_file_path: str):
+    def __init__(self, api_client: AsyncClientSession, fast_decode: bool = False):
         self.api_client = api_client
-        self.cache_file_path = Path(cache_file_path)
+        self.fast_decode = fast_decode  # Списки разбираются из исходного JSON, минуя ResourceObject
 
     async def get_group(self, group_id: str) -> GroupDTO:
         document: Document = await self.api_client.get(self.resource_name, group_id)
         group_res = document.resource
         return GroupDTO.from_jsonapi(group_res)
 
+    @thunder_protection(prefix="groups_list")
     async def get_groups(self) -> List[GroupDTO]:
         document: Document = await self.api_client.get(self.resource_name)
+        if self.fast_decode and document.json_data is not None:
+            return [GroupDTO.from_json(group) for group in primary_resources(document.json_data)]
         return [GroupDTO.from_jsonapi(group_res) for group_res in document.resources]
 
+    @thunder_protection(prefix="groups_with_faculties_list")
     async def get_groups_with_faculties(self) -> List[GroupDTO]:
         document: Document = await self.api_client.get(self.resource_name, Inclusion("faculty"))
+        return self._map_groups_with_faculties(document)
+
+    async def get_groups_with_faculties_if_modified(
+            self,
+            etag: Optional[str],
+    ) -> tuple[Optional[List[GroupDTO]], Optional[str]]:
+        """
+        Группы с факультетами, если коллекция изменилась с версии etag.
+        Возвращает (None, etag), если сервер ответил 304.
+        """
+        document = await self.api_client.get_if_modified(self.resource_name, Inclusion("faculty"), etag=etag)
+        if document is None:
+            return None, etag
+        return self._map_groups_with_faculties(document), document.etag
+
+    def _map_groups_with_faculties(self, document: Document) -> List[GroupDTO]:
+        if self.fast_decode and document.json_data is not None:
+            return self._decode_groups_with_faculties(document.json_data)
 
         faculties = {
             f.id: FacultyDTO.from_jsonapi(f)
@@ -41,3 +64,11 @@ class JsonApiGroupRepository:
             GroupDTO.from_jsonapi(g, faculty=faculties.get(g.faculty._resource_identifier.id))
             for g in document.resources
         ]
+
+    @staticmethod
+    def _decode_groups_with_faculties(json_data: dict) -> List[GroupDTO]:
+        faculties = {f["id"]: FacultyDTO.from_json(f) for f in included_of_type(json_data, "faculties")}
+        return [
+            GroupDTO.from_json(g, faculty=faculties.get(g["relationships"]["faculty"]["data"]["id"]))
+            for g in primary_resources(json_data)
+        ]
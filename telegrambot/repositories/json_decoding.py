@@ -0,0 +1,36 @@
+"""
+Разбор JSON:API документа напрямую в DTO, без графа ResourceObject jsonapi_client.
+
+Используется репозиториями на путях только для чтения (fast_decode=True).
+Запись (commit) и одиночные запросы по-прежнему идут через ResourceObject.
+Исходный JSON есть только у ленивых документов (api_lazy_documents), поэтому api_fast_decode
+включает ленивый режим сессии; у обычного документа (json_data is None) разбор идет через ResourceObject.
+"""
+from typing import Iterator, Optional
+
+ResourceKey = tuple[str, str]
+
+
+def primary_resources(json_data: dict) -> list[dict]:
+    """Объекты ресурсов секции data."""
+    data = json_data.get("data")
+    if isinstance(data, list):
+        return data
+    return [data] if data else []
+
+
+def index_included(json_data: dict) -> dict[ResourceKey, dict]:
+    """Объекты ресурсов секции included по (type, id)."""
+    return {(resource["type"], str(resource["id"])): resource for resource in json_data.get("included", ())}
+
+
+def included_of_type(json_data: dict, resource_type: str) -> Iterator[dict]:
+    """Объекты ресурсов секции included заданного типа."""
+    return (resource for resource in json_data.get("included", ()) if resource["type"] == resource_type)
+
+
+def related_key(resource: dict, rel_name: str) -> Optional[ResourceKey]:
+    """(type, id) ресурса, на который указывает to-one отношение, или None."""
+    relationship = resource.get("relationships", {}).get(rel_name)
+    data = relationship.get("data") if relationship else None
+    return (data["type"], str(data["id"])) if data else None
@@ -3,11 +3,15 @@ from typing import Any
 
 from jsonapi_client import Filter, Inclusion, Modifier
 from jsonapi_client.document import Document
+from jsonapi_client.objects import ResourceIdentifier
 
+from api_client import AsyncClientSession
+from api_client.thunder_protection import thunder_protection
 from dto import DateSpanDTO, GroupDTO, LessonDTO, TeacherDTO
 from dto.base_dto import SubscriptableDTO
 from repositories.base_repository import JsonApiBaseRepository
 from repositories.exceptions import ApiError
+from repositories.json_decoding import ResourceKey, index_included, primary_resources, related_key
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,12 @@ class JsonApiLessonRepository(JsonApiBaseRepository):
         "groups": GroupDTO,
     }
 
+    included_rel_names = ("teacher", "group")
+
+    def __init__(self, api_client: AsyncClientSession, fast_decode: bool = False):
+        super().__init__(api_client)
+        self.fast_decode = fast_decode  # Занятия разбираются из исходного JSON, минуя ResourceObject
+
     def _get_or_create_dto(self, resource, cache: dict):
         key = (resource.type, resource.id)
         if key not in cache:
@@ -31,17 +41,31 @@ class JsonApiLessonRepository(JsonApiBaseRepository):
             cache[key] = DtoClass.from_jsonapi(resource)
         return cache[key]
 
+    def _get_related_dto(self, lesson, rel_name: str, included: dict, cache: dict):
+        identifier = self._get_related_identifier(lesson, rel_name)
+        if identifier is None:
+            return None
+        resource = included.get(identifier.type, {}).get(identifier.id)
+        return self._get_or_create_dto(resource, cache) if resource is not None else None
+
     async def get_lesson(self, lesson_id: str) -> LessonDTO:
         document: Document = await self.api_client.get(self.resource_name, lesson_id)
         lesson_res = document.resource
         return LessonDTO.from_jsonapi(lesson_res)
 
-    async def get_lessons(self, obj: SubscriptableDTO, date_span: DateSpanDTO, **filters):
+    @thunder_protection(
+        prefix="lessons_list",
+        key=lambda self, obj, date_span, revalidate=False, **filters: (
+            id(self), obj.resource_type, obj.id, date_span.start, date_span.end, revalidate,
+            tuple(sorted(filters.items())),
+        ),
+    )
+    async def get_lessons(self, obj: SubscriptableDTO, date_span: DateSpanDTO, revalidate: bool = False, **filters):
         modifiers = [
             Filter(**{obj.relation_name: obj.id}),
             Filter(date_from=date_span.start_str),
             Filter(date_to=date_span.end_str),
-            Inclusion('teacher', 'group'),
+            Inclusion(*self.included_rel_names),
         ]
 
         # Проверка дополнительных фильтров
@@ -53,17 +77,24 @@ class JsonApiLessonRepository(JsonApiBaseRepository):
         modifier = sum(modifiers, Modifier())
 
         try:
-            document = await self.api_client.get(self.resource_name, modifier)
+            # revalidate - в обход stale-while-revalidate, для кеша со своим TTL (LessonService)
+            if revalidate:
+                document = await self.api_client.get_revalidated(self.resource_name, modifier)
+            else:
+                document = await self.api_client.get(self.resource_name, modifier)
+            if self.fast_decode and document.json_data is not None:
+                return await self._decode_lessons(document.json_data)
+
+            # Связанные группы и преподаватели берутся из included за один проход,
+            # недостающие догружаются одним конкурентным запросом
+            included = await self._resolve_included_resources(document, self.included_rel_names)
 
             lessons: list[LessonDTO] = []
             related_dto_cache: dict[tuple[str, str], Any] = {}
 
             for lesson in document.resources:
-                await lesson.group.fetch()
-                await lesson.teacher.fetch()
-
-                group_dto = self._get_or_create_dto(lesson.group.resource, related_dto_cache)
-                teacher_dto = self._get_or_create_dto(lesson.teacher.resource, related_dto_cache)
+                group_dto = self._get_related_dto(lesson, "group", included, related_dto_cache)
+                teacher_dto = self._get_related_dto(lesson, "teacher", included, related_dto_cache)
 
                 lessons.append(LessonDTO.from_jsonapi(lesson, group_dto, teacher_dto))
 
@@ -71,3 +102,42 @@ class JsonApiLessonRepository(JsonApiBaseRepository):
 
         except Exception as e:
             raise ApiError(f"Failed to get lessons for {obj.__class__.__name__} [ID={obj.id}]: {e}")
+
+    async def _decode_lessons(self, json_data: dict) -> list[LessonDTO]:
+        """
+        Занятия из исходного JSON: связанные группы и преподаватели берутся из included по (type, id),
+        недостающие догружаются одним конкурентным запросом, как на обычном пути.
+        """
+        lessons_json = primary_resources(json_data)
+        included = index_included(json_data)
+
+        missing: dict[tuple[str, str], ResourceIdentifier] = {}
+        for lesson in lessons_json:
+            for rel_name in self.included_rel_names:
+                key = related_key(lesson, rel_name)
+                if key is not None and key not in included:
+                    missing[key] = ResourceIdentifier(self.api_client, {"type": key[0], "id": key[1]})
+        fetched: dict[str, dict[str, Any]] = {}
+        await self._fetch_missing_resources(missing, fetched)
+
+        related_dto_cache: dict[ResourceKey, Any] = {}
+
+        def related_dto(lesson: dict, rel_name: str):
+            key = related_key(lesson, rel_name)
+            if key is None:
+                return None
+            if key not in related_dto_cache:
+                DtoClass = self.included_types_map.get(key[0])
+                if not DtoClass:
+                    raise ValueError(f"Unsupported related resource type: {key[0]}")
+                if key in included:
+                    related_dto_cache[key] = DtoClass.from_json(included[key])
+                else:
+                    resource = fetched.get(key[0], {}).get(key[1])
+                    related_dto_cache[key] = DtoClass.from_jsonapi(resource) if resource is not None else None
+            return related_dto_cache[key]
+
+        return [
+            LessonDTO.from_json(lesson, related_dto(lesson, "group"), related_dto(lesson, "teacher"))
+            for lesson in lessons_json
+        ]
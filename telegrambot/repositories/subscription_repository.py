@@ -1,10 +1,12 @@
 import logging
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from jsonapi_client import Filter, Inclusion
 from jsonapi_client.document import Document
+from jsonapi_client.objects import ResourceIdentifier
+from jsonapi_client.resourceobject import ResourceObject
 
-from context import set_hmac
+from context import request_context, set_hmac
 from dto import GroupDTO, SubscriptionDTO, TeacherDTO
 from dto.base_dto import SubscriptableDTO
 from repositories.base_repository import JsonApiBaseRepository
@@ -12,6 +14,9 @@ from repositories.exceptions import ApiError
 
 logger = logging.getLogger(__name__)
 
+# rel_name → функция получения уже известного DTO по id (например, GroupService.get_group)
+KnownObjects = dict[str, Callable[[int], Optional[SubscriptableDTO]]]
+
 
 class JsonApiSubscriptionRepository(JsonApiBaseRepository):
     resource_name = "subscriptions"
@@ -21,37 +26,61 @@ class JsonApiSubscriptionRepository(JsonApiBaseRepository):
         "group": GroupDTO,
     }
 
+    def _invalidate_user_cache(self) -> None:
+        """Сбрасывает кеш пользователя после изменения его подписок."""
+        user_id = request_context.get().get("user_id")
+        if user_id is not None:
+            self.api_client.invalidate_user(user_id)
+
     async def _map_document_to_dtos(
             self,
             document: Document,
-            rel_names: Optional[tuple[str, ...]] = None
+            rel_names: Optional[tuple[str, ...]] = None,
+            known_objects: Optional[KnownObjects] = None,
     ) -> List[SubscriptionDTO]:
         """
         Преобразует ресурсы из JSON:API документа в список DTO подписок.
 
         Для каждого ресурса документа:
           1. Определяет связанный объект по имени отношения (rel_name).
-          2. Загружает ресурс через `await rel.fetch()`.
-          3. Преобразует ресурс в соответствующий DTO (TeacherDTO или GroupDTO).
+          2. Берет готовый DTO из known_objects (кеш GroupService/TeacherService),
+             иначе ищет ресурс в секции included.
+          3. Ресурсы, которых нет ни там, ни там, догружаются одним конкурентным шагом.
           4. Создает SubscriptionDTO, объединяющий подписку и объект подписки.
-          5. Добавляет результат в итоговый список.
         """
         rel_names = rel_names or tuple(self.related_object_map.keys())
-        subscriptions = []
+        known_objects = known_objects or {}
+        included = self._separate_included_resources(document)
+
+        resolved: list[tuple[ResourceObject, str, ResourceIdentifier, Optional[SubscriptableDTO]]] = []
+        missing: dict[tuple[str, str], ResourceIdentifier] = {}
 
         for sub in document.resources:
             for rel_name in rel_names:
-                rel = getattr(sub, rel_name, None)
-                if rel is not None:
-                    await rel.fetch()
-                    SchemaDTO = self.related_object_map[rel_name]
-                    obj = SchemaDTO.from_jsonapi(rel.resource)
-                    subscriptions.append(SubscriptionDTO.from_jsonapi(sub, obj))
-                    break
+                identifier = self._get_related_identifier(sub, rel_name)
+                if identifier is None:
+                    continue
+
+                lookup = known_objects.get(rel_name)
+                obj = lookup(int(identifier.id)) if lookup is not None else None
+                if obj is None and identifier.id not in included.get(identifier.type, {}):
+                    missing[(identifier.type, identifier.id)] = identifier
+
+                resolved.append((sub, rel_name, identifier, obj))
+                break
+
+        await self._fetch_missing_resources(missing, included)
+
+        subscriptions = []
+        for sub, rel_name, identifier, obj in resolved:
+            if obj is None:
+                SchemaDTO = self.related_object_map[rel_name]
+                obj = SchemaDTO.from_jsonapi(included[identifier.type][identifier.id])
+            subscriptions.append(SubscriptionDTO.from_jsonapi(sub, obj))
 
         return subscriptions
 
-    async def get_user_subscriptions(self) -> List[SubscriptionDTO]:
+    async def get_user_subscriptions(self, known_objects: Optional[KnownObjects] = None) -> List[SubscriptionDTO]:
         """ Получает все подписки текущего пользователя. (текущий пользователь по контексту) """
         try:
             related_names = tuple(self.related_object_map.keys())
@@ -62,11 +91,15 @@ class JsonApiSubscriptionRepository(JsonApiBaseRepository):
                     Inclusion(*related_names)
                 )
 
-                return await self._map_document_to_dtos(document, related_names)
+                return await self._map_document_to_dtos(document, related_names, known_objects)
         except Exception as e:
             raise ApiError(f"Failed to getting user subscriptions: {str(e)}")
 
-    async def get_subscription_by_target(self, target_obj: SubscriptableDTO) -> Optional[SubscriptionDTO]:
+    async def get_subscription_by_target(
+            self,
+            target_obj: SubscriptableDTO,
+            known_objects: Optional[KnownObjects] = None,
+    ) -> Optional[SubscriptionDTO]:
         """
         Получает подписку пользователя на конкретный объект (группу или учителя).
 
@@ -84,7 +117,7 @@ class JsonApiSubscriptionRepository(JsonApiBaseRepository):
                     Inclusion(rel_name) + Filter(**{rel_name: obj_id})
                 )
 
-                subscriptions = await self._map_document_to_dtos(document, (rel_name,))
+                subscriptions = await self._map_document_to_dtos(document, (rel_name,), known_objects)
                 return subscriptions[0] if subscriptions else None
 
         except Exception as e:
@@ -104,6 +137,7 @@ class JsonApiSubscriptionRepository(JsonApiBaseRepository):
         with set_hmac(True):
             new_subscription = self.api_client.create(sub_type, {rel_name: str(rel_id)})
             await new_subscription.commit()
+        self._invalidate_user_cache()
 
         return SubscriptionDTO.from_jsonapi(new_subscription, target_obj)
 
@@ -115,5 +149,6 @@ class JsonApiSubscriptionRepository(JsonApiBaseRepository):
                 sub = document.resource
                 sub.delete()
                 await sub.commit()
+            self._invalidate_user_cache()
         except Exception as e:
             raise ApiError(f"Failed to delete subscription [ID={sub_id}]: {str(e)}")
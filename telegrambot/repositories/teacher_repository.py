@@ -1,11 +1,12 @@
 import logging
-from typing import List
-from pathlib import Path
+from typing import List, Optional
 
 from jsonapi_client.document import Document
 
 from api_client import AsyncClientSession
+from api_client.thunder_protection import thunder_protection
 from dto import TeacherDTO
+from repositories.json_decoding import primary_resources
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +14,31 @@ logger = logging.getLogger(__name__)
 class JsonApiTeacherRepository:
     resource_name = "teachers"
 
-    def __init__(self, api_client: AsyncClientSession, cache_file_path: str):
+    def __init__(self, api_client: AsyncClientSession, fast_decode: bool = False):
         self.api_client = api_client
-        self.cache_file_path = Path(cache_file_path)
+        self.fast_decode = fast_decode  # Списки разбираются из исходного JSON, минуя ResourceObject
 
     async def get_teacher(self, teacher_id: str) -> TeacherDTO:
         document: Document = await self.api_client.get(self.resource_name, teacher_id)
         group_res = document.resource
         return TeacherDTO.from_jsonapi(group_res)
 
+    @thunder_protection(prefix="teachers_list")
     async def get_teachers(self) -> List[TeacherDTO]:
         document: Document = await self.api_client.get(self.resource_name)
+        return self._map_teachers(document)
+
+    async def get_teachers_if_modified(self, etag: Optional[str]) -> tuple[Optional[List[TeacherDTO]], Optional[str]]:
+        """
+        Преподаватели, если коллекция изменилась с версии etag.
+        Возвращает (None, etag), если сервер ответил 304.
+        """
+        document = await self.api_client.get_if_modified(self.resource_name, etag=etag)
+        if document is None:
+            return None, etag
+        return self._map_teachers(document), document.etag
+
+    def _map_teachers(self, document: Document) -> List[TeacherDTO]:
+        if self.fast_decode and document.json_data is not None:
+            return [TeacherDTO.from_json(teacher) for teacher in primary_resources(document.json_data)]
         return [TeacherDTO.from_jsonapi(teacher_res) for teacher_res in document.resources]
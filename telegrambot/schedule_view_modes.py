@@ -22,6 +22,11 @@ class ScheduleMode:
     def __init__(self, *_args, **_kwargs):
         pass
 
+    @classmethod
+    def modes(cls) -> tuple["ScheduleMode", ...]:
+        """Все зарегистрированные режимы."""
+        return tuple(cls._registry.values())
+
     def __init_subclass__(cls, **kwargs):
         """Автоматически регистрирует подклассы."""
         super().__init_subclass__(**kwargs)
@@ -42,6 +47,10 @@ class ScheduleMode:
         next_page = shift + 1 if shift < self.max_forward_shift else None
         return prev_page, next_page
 
+    def get_adjacent_spans(self, shift: int) -> list[DateSpanDTO]:
+        """Диапазоны дат соседних страниц - наиболее вероятное следующее нажатие ◀️/▶️."""
+        return [self.get_span(shift=page) for page in self.get_page_range(shift) if page is not None]
+
     def __repr__(self):
         return f"<ScheduleMode {self.name!r}>"
 
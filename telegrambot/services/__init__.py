@@ -1,5 +1,6 @@
 from .group_service import GroupService
 from .lesson_service import LessonService
+from .search_service import SearchService
 from .subscription_service import SubscriptionService
 from .teacher_service import TeacherService
 from .user_service import UserService
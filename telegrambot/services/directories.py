@@ -0,0 +1,280 @@
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Optional
+
+from dto import FacultyDTO, GroupDTO, TeacherDTO
+from services.refresh_report import RefreshReport
+
+# Общий монотонный счетчик версий справочников: новая версия - новые данные
+_versions = itertools.count(1)
+
+
+def next_version() -> int:
+    return next(_versions)
+
+
+@dataclass(frozen=True, slots=True)
+class GroupDirectory:
+    """
+    Неизменяемый снимок справочника групп со всеми индексами.
+
+    Сервис публикует новый снимок одной заменой ссылки, поэтому читатель всегда видит
+    согласованные индексы одной версии. Словари снимка после создания не изменяются.
+
+    Разделы справочника (список факультетов, курсы факультета, группы курса) версионируются
+    отдельно: patch оставляет незатронутым разделам прежние версии, и собранные по ним
+    клавиатуры остаются в кеше.
+    """
+    groups_by_id: dict[int, GroupDTO] = field(default_factory=dict)                                 # group_id → GroupDTO
+    faculties_by_id: dict[int, FacultyDTO] = field(default_factory=dict)                            # faculty_id → FacultyDTO
+    faculties: tuple[FacultyDTO, ...] = ()                                                          # кортеж факультетов
+    grades_by_faculty: dict[int, tuple[int, ...]] = field(default_factory=dict)                     # faculty_id → курсы
+    groups_by_faculty_grade: dict[tuple[int, int], tuple[GroupDTO, ...]] = field(default_factory=dict)  # (faculty, grade) → группы
+    etag: Optional[str] = None      # ETag коллекции, из которой построен снимок
+    version: int = 0                # 0 - пустой справочник
+    # ("faculties",), ("grades", faculty_id), ("groups", faculty_id, grade) → версия раздела.
+    # Раздела нет в словаре - его версия равна версии снимка
+    section_versions: dict[tuple[Hashable, ...], int] = field(default_factory=dict)
+
+    def section_version(self, *section: Hashable) -> int:
+        """Версия раздела: меняется только при изменении данных раздела."""
+        return self.section_versions.get(section, self.version)
+
+    @classmethod
+    def build(cls, groups: Iterable[GroupDTO], etag: Optional[str] = None) -> "GroupDirectory":
+        """Строит индексы по списку групп."""
+        groups_by_id = {}
+        faculties_by_id = {}
+        grades_by_faculty = defaultdict(set)
+        groups_by_faculty_grade = defaultdict(list)
+
+        for g in groups:
+            groups_by_id[g.id] = g
+            faculties_by_id[g.faculty.id] = g.faculty
+            grades_by_faculty[g.faculty.id].add(g.grade)
+            groups_by_faculty_grade[(g.faculty.id, g.grade)].append(g)
+
+        return cls(
+            groups_by_id=groups_by_id,
+            faculties_by_id=faculties_by_id,
+            faculties=tuple(sorted(faculties_by_id.values(), key=lambda f: f.short_title)),
+            grades_by_faculty={fid: tuple(sorted(grades)) for fid, grades in grades_by_faculty.items()},
+            groups_by_faculty_grade={key: tuple(grps) for key, grps in groups_by_faculty_grade.items()},
+            etag=etag,
+            version=next_version(),
+        )
+
+    def patch(
+            self,
+            groups: list[GroupDTO],
+            groups_by_id: dict[int, GroupDTO],
+            report: RefreshReport,
+            etag: Optional[str] = None,
+    ) -> "GroupDirectory":
+        """Новый снимок с изменениями, незатронутые корзины переходят в него теми же объектами."""
+        affected = {(g.faculty.id, g.grade) for g in map(self.groups_by_id.get, (*report.removed, *report.changed))}
+        affected |= {(g.faculty.id, g.grade) for g in map(groups_by_id.get, (*report.added, *report.changed))}
+
+        faculties_by_id = {}
+        buckets = defaultdict(list)
+        for g in groups:
+            faculties_by_id[g.faculty.id] = g.faculty
+            key = (g.faculty.id, g.grade)
+            if key in affected:
+                buckets[key].append(g)
+
+        groups_by_faculty_grade = dict(self.groups_by_faculty_grade)
+        for key in affected:
+            if key in buckets:
+                groups_by_faculty_grade[key] = tuple(buckets[key])
+            else:
+                groups_by_faculty_grade.pop(key, None)
+
+        grades_by_faculty = dict(self.grades_by_faculty)
+        for faculty_id in {faculty_id for faculty_id, _ in affected}:
+            grades = tuple(sorted(grade for fid, grade in groups_by_faculty_grade if fid == faculty_id))
+            if grades:
+                grades_by_faculty[faculty_id] = grades
+            else:
+                grades_by_faculty.pop(faculty_id, None)
+
+        faculties = self.faculties
+        if faculties_by_id != self.faculties_by_id:
+            faculties = tuple(sorted(faculties_by_id.values(), key=lambda f: f.short_title))
+        else:
+            faculties_by_id = self.faculties_by_id
+
+        changed = {("groups", *key) for key in affected}
+        changed |= {
+            ("grades", faculty_id) for faculty_id, _ in affected
+            if grades_by_faculty.get(faculty_id) != self.grades_by_faculty.get(faculty_id)
+        }
+        if faculties is not self.faculties:
+            changed.add(("faculties",))
+
+        version = next_version()
+        sections = [
+            ("faculties",),
+            *(("grades", faculty_id) for faculty_id in grades_by_faculty),
+            *(("groups", *key) for key in groups_by_faculty_grade),
+        ]
+        return GroupDirectory(
+            groups_by_id=groups_by_id,
+            faculties_by_id=faculties_by_id,
+            faculties=faculties,
+            grades_by_faculty=grades_by_faculty,
+            groups_by_faculty_grade=groups_by_faculty_grade,
+            etag=etag,
+            version=version,
+            section_versions={s: version if s in changed else self.section_version(*s) for s in sections},
+        )
+
+    def to_snapshot(self) -> dict:
+        """
+        Данные для снимка на диске: поля DTO и индексы в виде списков id.
+        Ключи JSON - только строки, поэтому словари с числовыми ключами хранятся списками пар.
+        """
+        return {
+            "etag": self.etag,
+            "faculties": [f.model_dump() for f in self.faculties],
+            "groups": [g.model_dump(exclude={"faculty"}) for g in self.groups_by_id.values()],
+            "grades_by_faculty": [[faculty_id, list(grades)] for faculty_id, grades in self.grades_by_faculty.items()],
+            "groups_by_faculty_grade": [
+                [faculty_id, grade, [g.id for g in grps]]
+                for (faculty_id, grade), grps in self.groups_by_faculty_grade.items()
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: dict) -> "GroupDirectory":
+        """
+        Справочник из данных to_snapshot под новой версией, индексы восстанавливаются
+        по спискам id без сортировок и группировок build.
+        DTO проходят валидацию: в pydantic 2 она быстрее model_construct (см. benchmarks.dto_construction),
+        а снимок с неожиданными данными отклоняется, как и с неожиданной структурой.
+        """
+        faculties = tuple(FacultyDTO(**f) for f in state["faculties"])
+        faculties_by_id = {f.id: f for f in faculties}
+        groups_by_id = {
+            g["id"]: GroupDTO(**g, faculty=faculties_by_id[g["faculty_id"]]) for g in state["groups"]
+        }
+        return cls(
+            groups_by_id=groups_by_id,
+            faculties_by_id=faculties_by_id,
+            faculties=faculties,
+            grades_by_faculty={faculty_id: tuple(grades) for faculty_id, grades in state["grades_by_faculty"]},
+            groups_by_faculty_grade={
+                (faculty_id, grade): tuple(groups_by_id[group_id] for group_id in group_ids)
+                for faculty_id, grade, group_ids in state["groups_by_faculty_grade"]
+            },
+            etag=state["etag"],
+            version=next_version(),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TeacherDirectory:
+    """
+    Неизменяемый снимок справочника преподавателей со всеми индексами (см. GroupDirectory).
+    Разделы: ("letters",) и ("teachers", letter).
+    """
+    teachers: tuple[TeacherDTO, ...] = ()
+    teachers_by_id: dict[int, TeacherDTO] = field(default_factory=dict)
+    teachers_by_bucket: dict[str, tuple[TeacherDTO, ...]] = field(default_factory=dict)  # буква → преподаватели
+    letters: tuple[str, ...] = ()   # буквы-бакеты в алфавитном порядке
+    etag: Optional[str] = None
+    version: int = 0
+    section_versions: dict[tuple[Hashable, ...], int] = field(default_factory=dict)
+
+    def section_version(self, *section: Hashable) -> int:
+        """Версия раздела: меняется только при изменении данных раздела."""
+        return self.section_versions.get(section, self.version)
+
+    @staticmethod
+    def letter_of(teacher: TeacherDTO) -> str:
+        """Буква алфавитного указателя, к которой относится преподаватель."""
+        return teacher.full_name[0].upper()
+
+    @classmethod
+    def build(cls, teachers: list[TeacherDTO], etag: Optional[str] = None) -> "TeacherDirectory":
+        """Строит индексы по списку преподавателей."""
+        buckets: defaultdict[str, list[TeacherDTO]] = defaultdict(list)
+        for t in teachers:
+            buckets[cls.letter_of(t)].append(t)
+
+        return cls(
+            teachers=tuple(teachers),
+            teachers_by_id={t.id: t for t in teachers},
+            teachers_by_bucket={k: tuple(sorted(v, key=lambda t: t.full_name)) for k, v in buckets.items()},
+            letters=tuple(sorted(buckets)),
+            etag=etag,
+            version=next_version(),
+        )
+
+    def patch(
+            self,
+            teachers: list[TeacherDTO],
+            teachers_by_id: dict[int, TeacherDTO],
+            report: RefreshReport,
+            etag: Optional[str] = None,
+    ) -> "TeacherDirectory":
+        """Новый снимок с изменениями, незатронутые буквы переходят в него теми же объектами."""
+        affected = {self.letter_of(t) for t in map(self.teachers_by_id.get, (*report.removed, *report.changed))}
+        affected |= {self.letter_of(t) for t in map(teachers_by_id.get, (*report.added, *report.changed))}
+
+        buckets: defaultdict[str, list[TeacherDTO]] = defaultdict(list)
+        for t in teachers:
+            letter = self.letter_of(t)
+            if letter in affected:
+                buckets[letter].append(t)
+
+        teachers_by_bucket = dict(self.teachers_by_bucket)
+        for letter in affected:
+            if letter in buckets:
+                teachers_by_bucket[letter] = tuple(sorted(buckets[letter], key=lambda t: t.full_name))
+            else:
+                teachers_by_bucket.pop(letter, None)
+
+        letters = tuple(sorted(teachers_by_bucket))
+        changed = {("teachers", letter) for letter in affected}
+        if letters != self.letters:
+            changed.add(("letters",))
+
+        version = next_version()
+        sections = [("letters",), *(("teachers", letter) for letter in teachers_by_bucket)]
+        return TeacherDirectory(
+            teachers=tuple(teachers),
+            teachers_by_id=teachers_by_id,
+            teachers_by_bucket=teachers_by_bucket,
+            letters=letters,
+            etag=etag,
+            version=version,
+            section_versions={s: version if s in changed else self.section_version(*s) for s in sections},
+        )
+
+    def to_snapshot(self) -> dict:
+        """Данные для снимка на диске (см. GroupDirectory.to_snapshot)."""
+        return {
+            "etag": self.etag,
+            "teachers": [t.model_dump() for t in self.teachers],
+            "teachers_by_bucket": {letter: [t.id for t in bucket] for letter, bucket in self.teachers_by_bucket.items()},
+            "letters": list(self.letters),
+        }
+
+    @classmethod
+    def from_snapshot(cls, state: dict) -> "TeacherDirectory":
+        """Справочник из данных to_snapshot под новой версией (см. GroupDirectory.from_snapshot)."""
+        teachers = tuple(TeacherDTO(**t) for t in state["teachers"])
+        teachers_by_id = {t.id: t for t in teachers}
+        return cls(
+            teachers=teachers,
+            teachers_by_id=teachers_by_id,
+            teachers_by_bucket={
+                letter: tuple(teachers_by_id[teacher_id] for teacher_id in teacher_ids)
+                for letter, teacher_ids in state["teachers_by_bucket"].items()
+            },
+            letters=tuple(state["letters"]),
+            etag=state["etag"],
+            version=next_version(),
+        )
@@ -1,57 +1,97 @@
+import asyncio
 import logging
-from collections import defaultdict
-from typing import List
+from dataclasses import replace
+from typing import Optional
 
 from dependency_injector.wiring import inject, Provide
 
+from api_client.json_codec import JsonCodec
+from api_client.thunder_protection import thunder_protection
+from cache import SnapshotStore, schema_version
 from dto import GroupDTO, FacultyDTO
 from repositories import JsonApiGroupRepository
+from services.directories import GroupDirectory
+from services.refresh_report import RefreshReport
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = schema_version(GroupDTO, FacultyDTO)
+
 
 class GroupService:
-    _groups_by_id: dict[int, GroupDTO] = {}                                     # group_id → GroupDTO
-    _faculties_by_id: dict[int, FacultyDTO] = {}                                # faculty_id → FacultyDTO
-    _grades_by_faculty: dict[int, tuple[int, ...]] = {}                         # faculty_id → set  курсов
-    _groups_by_faculty_grade: dict[tuple[int, int], tuple[GroupDTO, ...]] = {}  # (faculty, grade) → группы
-    _faculties: tuple[FacultyDTO, ...] = ()                                     # кортеж факультетов
+    def __init__(self, snapshot_path: Optional[str] = None, json_codec: Optional[JsonCodec] = None):
+        self._snapshot = SnapshotStore(snapshot_path, SNAPSHOT_VERSION, json_codec) if snapshot_path else None
+        # Текущий снимок справочника. Заменяется целиком, поэтому чтение не требует блокировок
+        self._directory = GroupDirectory()
+
+    @property
+    def directory(self) -> GroupDirectory:
+        return self._directory
+
+    @property
+    def version(self) -> int:
+        """Версия данных справочника: меняется только при изменении данных."""
+        return self._directory.version
+
+    def restore(self) -> bool:
+        """Загружает группы из снимка на диске. True, если данные восстановлены."""
+        state = self._snapshot.load() if self._snapshot else None
+        if state is None:
+            return False
+        try:
+            directory = GroupDirectory.from_snapshot(state)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Groups snapshot has unexpected structure, ignored: {e}")
+            return False
+        self._directory = directory
+        logger.info(f"Restored {len(directory.groups_by_id)} groups from snapshot.")
+        return True
 
+    @thunder_protection(prefix="groups_refresh", key=lambda self, *args, **kwargs: id(self))
     @inject
     async def refresh(
             self,
             group_repo: JsonApiGroupRepository = Provide["repositories.group"]
-    ):
-        groups: List[GroupDTO] = await group_repo.get_groups_with_faculties()
-
-        groups_by_id = {}
-        faculties_by_id = {}
-        grades_by_faculty = defaultdict(set)
-        groups_by_faculty_grade = defaultdict(list)
-
-        for g in groups:
-            groups_by_id[g.id] = g
-            faculties_by_id[g.faculty.id] = g.faculty
-            grades_by_faculty[g.faculty.id].add(g.grade)
-            groups_by_faculty_grade[(g.faculty.id, g.grade)].append(g)
-
-        self._groups_by_id = groups_by_id
-        self._faculties_by_id = faculties_by_id
-        self._faculties = tuple(sorted(faculties_by_id.values(), key=lambda f: f.short_title))
-        self._grades_by_faculty = {fid: tuple(sorted(grades)) for fid, grades in grades_by_faculty.items()}
-        self._groups_by_faculty_grade = {key: tuple(grps) for key, grps in groups_by_faculty_grade.items()}
+    ) -> RefreshReport:
+        """
+        Инкрементальное обновление: при неизменной коллекции (304) ничего не делает,
+        иначе перестраивает только затронутые изменениями корзины (факультет, курс).
+        """
+        current = self._directory
+        groups, etag = await group_repo.get_groups_with_faculties_if_modified(current.etag)
+        if groups is None:
+            return RefreshReport(not_modified=True)
+
+        groups_by_id = {g.id: g for g in groups}
+        report = RefreshReport.diff(current.groups_by_id, groups_by_id)
+
+        if not current.groups_by_id:
+            directory = GroupDirectory.build(groups, etag)
+        elif report.has_changes:
+            directory = current.patch(groups, groups_by_id, report, etag)
+        elif etag != current.etag:
+            directory = replace(current, etag=etag)
+        else:
+            directory = current
+
+        self._directory = directory
+        if self._snapshot and directory is not current:
+            await asyncio.to_thread(lambda: self._snapshot.save(directory.to_snapshot()))
+
+        logger.info(f"Groups refreshed: {report}, version {directory.version}")
+        return report
 
     def get_faculties(self) -> tuple[FacultyDTO, ...]:
-        return self._faculties
+        return self._directory.faculties
 
     def get_faculty(self, faculty_id: int) -> FacultyDTO:
-        return self._faculties_by_id.get(faculty_id)
+        return self._directory.faculties_by_id.get(faculty_id)
 
     def get_grades_for_faculty(self, faculty_id: int) -> tuple[int, ...]:
-        return self._grades_by_faculty.get(faculty_id, ())
+        return self._directory.grades_by_faculty.get(faculty_id, ())
 
     def get_groups_for_faculty_grade(self, faculty_id: int, grade: int) -> tuple[GroupDTO, ...]:
-        return self._groups_by_faculty_grade.get((faculty_id, grade), ())
+        return self._directory.groups_by_faculty_grade.get((faculty_id, grade), ())
 
     def get_group(self, group_id: int) -> GroupDTO | None:
-        return self._groups_by_id.get(group_id)
+        return self._directory.groups_by_id.get(group_id)
@@ -1,7 +1,12 @@
+import asyncio
 import logging
+from dataclasses import dataclass
 
+from cachetools import TTLCache
 from dependency_injector.wiring import inject, Provide
 
+from api_client.thunder_protection import thunder_protection
+from cache import LessonWindowCache
 from dto import DateSpanDTO, LessonDTO
 from dto.base_dto import SubscriptableDTO
 from repositories import JsonApiLessonRepository
@@ -9,14 +14,115 @@ from repositories import JsonApiLessonRepository
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PrefetchStats:
+    issued: int = 0     # Выполненные упреждающие загрузки
+    skipped: int = 0    # Пропущенные из-за исчерпания бюджета конкурентности
+    hits: int = 0       # Страницы, отданные из памяти благодаря упреждающей загрузке
+    wasted: int = 0     # Загрузки, которые устарели, так и не понадобившись
+
+    @property
+    def hit_rate(self) -> float:
+        resolved = self.hits + self.wasted
+        return self.hits / resolved if resolved else 0.0
+
+
 class LessonService:
+    def __init__(
+            self,
+            cache_maxsize: int = 1000,
+            cache_ttl: int = 300,
+            prefetch_enabled: bool = False,
+            prefetch_concurrency: int = 4,
+    ):
+        self._cache = LessonWindowCache(maxsize=cache_maxsize, ttl=cache_ttl)
+
+        self._prefetch_enabled = prefetch_enabled and self._cache.enabled
+        self._prefetch_concurrency = prefetch_concurrency
+        # Запланированные, но не завершенные загрузки. Считаются при создании задачи:
+        # еще не начавшиеся задачи тоже занимают бюджет
+        self._prefetch_tasks: set[asyncio.Task] = set()
+        # Загруженные заранее, но еще не запрошенные страницы: (type, id, start, end)
+        self._prefetched: TTLCache = TTLCache(maxsize=cache_maxsize, ttl=max(cache_ttl, 1))
+        self.prefetch_stats = PrefetchStats()
+
+    @staticmethod
+    def _prefetch_key(target_obj: SubscriptableDTO, date_span: DateSpanDTO) -> tuple:
+        return target_obj.resource_type, target_obj.id, date_span.start, date_span.end
 
-    @inject
     async def get_lessons(
+            self,
+            target_obj: SubscriptableDTO,
+            date_span: DateSpanDTO,
+            **filters,
+    ) -> list[LessonDTO]:
+        if self._prefetch_enabled and not filters:
+            self._account_prefetch_hit(target_obj, date_span)
+        return await self._load_lessons(target_obj, date_span, **filters)
+
+    @inject
+    async def _load_lessons(
             self,
             target_obj: SubscriptableDTO,
             date_span: DateSpanDTO,
             lesson_repo: JsonApiLessonRepository = Provide["repositories.lesson"],
             **filters,
     ) -> list[LessonDTO]:
-        return await lesson_repo.get_lessons(target_obj, date_span, **filters)
+        # Запросы с дополнительными фильтрами не кешируются
+        if filters or not self._cache.enabled:
+            return await lesson_repo.get_lessons(target_obj, date_span, **filters)
+
+        # Загружаем только отсутствующие/устаревшие промежутки, остальное отдаем срезом из кеша.
+        # Промежутки ревалидируются на сервере: документ из кеша сессии мог быть устаревшим (до hard_ttl),
+        # и окно считало бы его свежим еще cache_ttl
+        gaps = self._cache.missing_spans(target_obj, date_span)
+        if gaps:
+            results = await asyncio.gather(
+                *(lesson_repo.get_lessons(target_obj, gap, revalidate=True) for gap in gaps)
+            )
+            for gap, lessons in zip(gaps, results):
+                self._cache.store(target_obj, gap, lessons)
+
+        return self._cache.slice(target_obj, date_span)
+
+    def schedule_prefetch(self, target_obj: SubscriptableDTO, *date_spans: DateSpanDTO) -> None:
+        """
+        Запускает фоновую загрузку соседних страниц расписания, чтобы перелистывание
+        отдавалось из памяти. Если бюджет конкурентности исчерпан, загрузка пропускается.
+        """
+        if not self._prefetch_enabled:
+            return
+
+        for date_span in date_spans:
+            if not self._cache.missing_spans(target_obj, date_span):
+                continue
+            if len(self._prefetch_tasks) >= self._prefetch_concurrency:
+                self.prefetch_stats.skipped += 1
+                continue
+
+            task = asyncio.create_task(self._prefetch(target_obj, date_span))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+
+    @thunder_protection(
+        prefix="lessons_prefetch",
+        key=lambda self, target_obj, date_span: (id(self), *LessonService._prefetch_key(target_obj, date_span)),
+    )
+    async def _prefetch(self, target_obj: SubscriptableDTO, date_span: DateSpanDTO) -> None:
+        try:
+            await self._load_lessons(target_obj, date_span)
+        except Exception as e:
+            logger.warning(f"Lessons prefetch failed for {target_obj.resource_type}:{target_obj.id}: {e}")
+            return
+
+        self._expire_prefetched()
+        self._prefetched[self._prefetch_key(target_obj, date_span)] = True
+        self.prefetch_stats.issued += 1
+
+    def _account_prefetch_hit(self, target_obj: SubscriptableDTO, date_span: DateSpanDTO) -> None:
+        self._expire_prefetched()
+        if self._prefetched.pop(self._prefetch_key(target_obj, date_span), None):
+            self.prefetch_stats.hits += 1
+
+    def _expire_prefetched(self) -> None:
+        self.prefetch_stats.wasted += len(self._prefetched.expire())
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+
+@dataclass(frozen=True)
+class RefreshReport:
+    """Итог обновления справочника из API."""
+    not_modified: bool = False      # Сервер ответил 304, данные не запрашивались
+    added: tuple[int, ...] = ()
+    removed: tuple[int, ...] = ()
+    changed: tuple[int, ...] = ()
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @classmethod
+    def diff(cls, old: Mapping[int, Any], new: Mapping[int, Any]) -> "RefreshReport":
+        """Сравнивает два индекса id → DTO."""
+        return cls(
+            added=tuple(obj_id for obj_id in new if obj_id not in old),
+            removed=tuple(obj_id for obj_id in old if obj_id not in new),
+            changed=tuple(obj_id for obj_id, obj in new.items() if obj_id in old and old[obj_id] != obj),
+        )
+
+    def __str__(self) -> str:
+        if self.not_modified:
+            return "not modified"
+        return f"added={len(self.added)}, removed={len(self.removed)}, changed={len(self.changed)}"
@@ -0,0 +1,133 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+_NOT_WORD = re.compile(r"[^\w]+")
+_NORMALIZE = str.maketrans({"ё": "е", "_": " "})
+
+MIN_SIMILARITY = 0.3        # Сходство слов по триграммам, ниже которого слово не считается опечаткой
+SIMILARITY_SPREAD = 0.1     # Насколько похожее слово может уступать лучшему
+
+
+def normalize(text: str) -> str:
+    """Приводит строку к виду для поиска: нижний регистр, ё → е, слова через один пробел."""
+    return " ".join(_NOT_WORD.sub(" ", text.lower().translate(_NORMALIZE)).split())
+
+
+def trigrams(token: str) -> set[str]:
+    """Триграммы слова с границами: опечатка портит не больше трех из них."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex(Generic[T]):
+    """
+    Неизменяемый индекс поиска по названиям.
+
+    1. Названия, начинающиеся с запроса: бинарный поиск по отсортированным названиям.
+    2. Названия, в которых каждое слово запроса - префикс какого-либо слова ("иван серг"
+       находит "Иванов Сергей"): бинарный поиск по словарю слов и пересечение их списков.
+    3. Слово запроса, не являющееся префиксом ни одного слова, считается опечаткой и заменяется
+       похожими словами словаря по триграммам ("ивонов" → "иванов").
+
+    Названия пронумерованы по (длине, алфавиту), поэтому ранжирование внутри шага - выбор
+    наименьших номеров без вычисления ключей.
+    """
+
+    def __init__(self, entries: Iterable[tuple[T, str]]):
+        normalized = sorted(
+            ((name, item) for item, name in ((item, normalize(text)) for item, text in entries) if name),
+            key=lambda entry: (len(entry[0]), entry[0]),
+        )
+        self._items: list[T] = [item for _, item in normalized]
+        self._names: list[str] = [name for name, _ in normalized]
+
+        by_name = sorted(range(len(self._names)), key=self._names.__getitem__)
+        self._sorted_names = [self._names[idx] for idx in by_name]
+        self._sorted_ids = by_name
+
+        words: dict[str, list[int]] = defaultdict(list)
+        for idx, name in enumerate(self._names):
+            for word in set(name.split()):
+                words[word].append(idx)
+        self._words = sorted(words)
+        self._postings = [tuple(words[word]) for word in self._words]
+
+        grams: dict[str, list[int]] = defaultdict(list)
+        self._word_grams = []
+        for position, word in enumerate(self._words):
+            word_grams = trigrams(word)
+            self._word_grams.append(len(word_grams))
+            for gram in word_grams:
+                grams[gram].append(position)
+        self._grams = {gram: tuple(positions) for gram, positions in grams.items()}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _prefix_range(self, words: list[str], prefix: str) -> range:
+        start = bisect_left(words, prefix)
+        return range(start, bisect_left(words, prefix + "\uffff", lo=start))
+
+    def _similar_words(self, token: str) -> list[int]:
+        """Слова словаря, похожие на token (коэффициент Жаккара по триграммам)."""
+        token_grams = trigrams(token)
+        counts = Counter()
+        for gram in token_grams:
+            counts.update(self._grams.get(gram, ()))
+
+        # Сходство не больше count / len(token_grams): слова с малым числом общих триграмм отсекаются сразу
+        min_count = MIN_SIMILARITY * len(token_grams)
+        total, word_grams = len(token_grams), self._word_grams
+        scores = {
+            position: count / (total + word_grams[position] - count)
+            for position, count in counts.items() if count >= min_count
+        }
+        best = max(scores.values(), default=0)
+        # Только лучшие кандидаты: иначе "ивонов" совпадет и с "новиков"
+        threshold = max(MIN_SIMILARITY, best - SIMILARITY_SPREAD)
+        return [position for position, score in scores.items() if score >= threshold]
+
+    def _token_matches(self, token: str) -> set[int]:
+        """Названия, в которых есть слово с префиксом token или, при опечатке, похожее слово."""
+        positions = self._prefix_range(self._words, token) or self._similar_words(token)
+        found = set()
+        for position in positions:
+            found.update(self._postings[position])
+        return found
+
+    def search(self, query: str, limit: int = 10) -> list[T]:
+        """Лучшие совпадения: названия, начинающиеся с запроса, затем совпадения по словам."""
+        name = normalize(query)
+        if not name or limit <= 0:
+            return []
+
+        # Номера названий упорядочены по (длине, алфавиту): лучшие - наименьшие номера диапазона
+        starting = self._prefix_range(self._sorted_names, name)
+        ranked = heapq.nsmallest(limit, self._sorted_ids[starting.start:starting.stop])
+        if len(ranked) < limit:
+            matched = None
+            for token in name.split():
+                found = self._token_matches(token)
+                matched = found if matched is None else matched & found
+                if not matched:
+                    break
+            matched.difference_update(ranked)
+            ranked += heapq.nsmallest(limit - len(ranked), matched)
+
+        return [self._items[idx] for idx in ranked]
+
+    def exact(self, query: str) -> list[T]:
+        """Названия, полностью совпадающие с запросом после нормализации."""
+        name = normalize(query)
+        if not name:
+            return []
+        matches = self._prefix_range(self._sorted_names, name)
+        return [
+            self._items[self._sorted_ids[i]]
+            for i in matches if self._sorted_names[i] == name
+        ]
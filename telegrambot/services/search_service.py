@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+
+from dependency_injector.wiring import inject, Provide
+
+from dto.base_dto import SubscriptableDTO
+from services.directories import GroupDirectory, TeacherDirectory
+from services.group_service import GroupService
+from services.search_index import SearchIndex
+from services.teacher_service import TeacherService
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """
+    Поиск групп и преподавателей по названию.
+
+    Индекс строится по текущим снимкам справочников и перестраивается только при смене их версий.
+    Построение идет в отдельном потоке, поиск до его окончания работает по прежнему индексу.
+    """
+
+    def __init__(self):
+        self._index: SearchIndex[SubscriptableDTO] = SearchIndex(())
+        self._versions: tuple[int, int] = (0, 0)    # версии справочников групп и преподавателей в индексе
+
+    @staticmethod
+    def _build(groups: GroupDirectory, teachers: TeacherDirectory) -> SearchIndex[SubscriptableDTO]:
+        entries = [(group, group.title) for group in groups.groups_by_id.values()]
+        entries += [(teacher, teacher.full_name) for teacher in teachers.teachers]
+        return SearchIndex(entries)
+
+    @inject
+    async def rebuild(
+            self,
+            group_service: GroupService = Provide["services.group"],
+            teacher_service: TeacherService = Provide["services.teacher"],
+    ) -> bool:
+        """Перестраивает индекс, если справочники изменились. True, если индекс перестроен."""
+        groups, teachers = group_service.directory, teacher_service.directory
+        versions = (groups.version, teachers.version)
+        if versions == self._versions:
+            return False
+
+        started = time.perf_counter()
+        index = await asyncio.to_thread(self._build, groups, teachers)
+        self._index, self._versions = index, versions
+        logger.info(f"Search index rebuilt: {len(index)} names in {(time.perf_counter() - started) * 1000:.1f} ms.")
+        return True
+
+    def search(self, query: str, limit: int = 10) -> list[SubscriptableDTO]:
+        """Группы и преподаватели, лучше всего совпадающие с запросом."""
+        return self._index.search(query, limit)
+
+    def find_exact(self, query: str) -> list[SubscriptableDTO]:
+        """Группы и преподаватели, название которых совпадает с запросом."""
+        return self._index.exact(query)
@@ -6,18 +6,33 @@ from dependency_injector.wiring import Provide, inject
 from dto import SubscriptionDTO
 from dto.subscription_dto import SubscriptableDTO
 from repositories import JsonApiSubscriptionRepository
+from repositories.subscription_repository import KnownObjects
+from services.group_service import GroupService
+from services.teacher_service import TeacherService
 
 logger = logging.getLogger(__name__)
 
 
 class SubscriptionService:
 
+    @staticmethod
+    @inject
+    def _known_objects(
+            group_service: GroupService = Provide["services.group"],
+            teacher_service: TeacherService = Provide["services.teacher"],
+    ) -> KnownObjects:
+        """Готовые DTO из справочников, чтобы не собирать их заново из документа подписок."""
+        return {
+            "group": group_service.get_group,
+            "teacher": teacher_service.get_teacher,
+        }
+
     @inject
     async def get_user_subscriptions(
             self,
             subscription_repo: JsonApiSubscriptionRepository = Provide["repositories.subscription"]
     ) -> List[SubscriptionDTO]:
-        return await subscription_repo.get_user_subscriptions()
+        return await subscription_repo.get_user_subscriptions(self._known_objects())
 
     @inject
     async def get_subscription_by_target(
@@ -25,7 +40,7 @@ class SubscriptionService:
             target_obj: SubscriptableDTO,
             subscription_repo: JsonApiSubscriptionRepository = Provide["repositories.subscription"]
     ) -> Optional[SubscriptionDTO]:
-        return await subscription_repo.get_subscription_by_target(target_obj)
+        return await subscription_repo.get_subscription_by_target(target_obj, self._known_objects())
 
 
     # async def is_subscribed(self, target_obj: SubscriptableDTO,) -> bool:
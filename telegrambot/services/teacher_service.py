@@ -1,48 +1,94 @@
+import asyncio
 import logging
-from collections import defaultdict
-from typing import Optional, List, Dict
+from dataclasses import replace
+from typing import Optional
 
 from dependency_injector.wiring import inject, Provide
 
+from api_client.json_codec import JsonCodec
+from api_client.thunder_protection import thunder_protection
+from cache import SnapshotStore, schema_version
 from dto import TeacherDTO
 from repositories import JsonApiTeacherRepository
+from services.directories import TeacherDirectory
+from services.refresh_report import RefreshReport
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = schema_version(TeacherDTO)
+
 
 class TeacherService:
-    _teachers: tuple[TeacherDTO, ...] = ()
-    _teachers_by_id: Dict[int, TeacherDTO] = {}
-    _teachers_by_bucket: dict[str, tuple[TeacherDTO, ...]] = {}
+    def __init__(self, snapshot_path: Optional[str] = None, json_codec: Optional[JsonCodec] = None):
+        self._snapshot = SnapshotStore(snapshot_path, SNAPSHOT_VERSION, json_codec) if snapshot_path else None
+        # Текущий снимок справочника. Заменяется целиком, поэтому чтение не требует блокировок
+        self._directory = TeacherDirectory()
+
+    @property
+    def directory(self) -> TeacherDirectory:
+        return self._directory
+
+    @property
+    def version(self) -> int:
+        """Версия данных справочника: меняется только при изменении данных."""
+        return self._directory.version
 
+    def restore(self) -> bool:
+        """Загружает преподавателей из снимка на диске. True, если данные восстановлены."""
+        state = self._snapshot.load() if self._snapshot else None
+        if state is None:
+            return False
+        try:
+            directory = TeacherDirectory.from_snapshot(state)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Teachers snapshot has unexpected structure, ignored: {e}")
+            return False
+        self._directory = directory
+        logger.info(f"Restored {len(directory.teachers)} teachers from snapshot.")
+        return True
+
+    @thunder_protection(prefix="teachers_refresh", key=lambda self, *args, **kwargs: id(self))
     @inject
     async def refresh(
             self,
             teacher_repo: JsonApiTeacherRepository = Provide["repositories.teacher"]
-    ):
-        teachers: List[TeacherDTO] = await teacher_repo.get_teachers()
+    ) -> RefreshReport:
+        """
+        Инкрементальное обновление: при неизменной коллекции (304) ничего не делает,
+        иначе перестраивает только затронутые изменениями буквы.
+        """
+        current = self._directory
+        teachers, etag = await teacher_repo.get_teachers_if_modified(current.etag)
+        if teachers is None:
+            return RefreshReport(not_modified=True)
 
         teachers_by_id = {t.id: t for t in teachers}
-        buckets: defaultdict[str, list[TeacherDTO]] = defaultdict(list)
+        report = RefreshReport.diff(current.teachers_by_id, teachers_by_id)
+
+        if not current.teachers_by_id:
+            directory = TeacherDirectory.build(teachers, etag)
+        elif report.has_changes:
+            directory = current.patch(teachers, teachers_by_id, report, etag)
+        elif etag != current.etag:
+            directory = replace(current, etag=etag)
+        else:
+            directory = current
 
-        for t in teachers:
-            buckets[t.full_name[0].upper()].append(t)
+        self._directory = directory
+        if self._snapshot and directory is not current:
+            await asyncio.to_thread(lambda: self._snapshot.save(directory.to_snapshot()))
 
-        self._teachers = tuple(teachers)
-        self._teachers_by_id = teachers_by_id
-        self._teachers_by_bucket = {
-            k: tuple(sorted(v, key=lambda t: t.full_name))
-            for k, v in buckets.items()
-        }
+        logger.info(f"Teachers refreshed: {report}, version {directory.version}")
+        return report
 
     def get_teachers(self, letter: Optional[str] = None) -> tuple[TeacherDTO, ...]:
         if letter is None:
-            return self._teachers
-        return self._teachers_by_bucket.get(letter, ())
+            return self._directory.teachers
+        return self._directory.teachers_by_bucket.get(letter, ())
 
     def get_teacher(self, teacher_id: int) -> TeacherDTO | None:
-        return self._teachers_by_id.get(teacher_id)
+        return self._directory.teachers_by_id.get(teacher_id)
 
     def get_letters(self) -> tuple[str, ...]:
         """Возвращает список букв-бакетов (в алфавитном порядке)."""
-        return tuple(sorted(self._teachers_by_bucket.keys()))
+        return self._directory.letters
@@ -3,7 +3,8 @@ import logging
 from dependency_injector.wiring import Provide, inject
 
 from dto import AuthDTO, AuthResponseDTO, UserDTO
-from repositories import JsonApiAccountRepository, JsonApiSubscriptionRepository, JsonApiUserRepository
+from repositories import JsonApiAccountRepository, JsonApiUserRepository
+from services.subscription_service import SubscriptionService
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +26,10 @@ class UserService:
     async def get_user_with_subscriptions(
             self,
             user_repo: JsonApiUserRepository = Provide["repositories.user"],
-            subscription_repo: JsonApiSubscriptionRepository = Provide["repositories.subscription"]
+            subscription_service: SubscriptionService = Provide["services.subscription"]
     ) -> UserDTO:
         user = await user_repo.get_user()
-        subscriptions = await subscription_repo.get_user_subscriptions()
+        subscriptions = await subscription_service.get_user_subscriptions()
         user.subscriptions = subscriptions
 
         return user
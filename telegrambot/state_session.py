@@ -0,0 +1,331 @@
+import asyncio
+import copy
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import SimpleEventIsolation
+from aiogram.fsm.storage.redis import RedisStorage
+from cachetools import TLRUCache
+
+logger = logging.getLogger(__name__)
+
+_UNCHANGED = object()
+
+
+def _state_name(state: StateType) -> Optional[str]:
+    return state.state if isinstance(state, State) else state
+
+
+class PipelinedRedisStorage(RedisStorage):
+    """RedisStorage, читающий и записывающий состояние и данные FSM одним запросом (pipeline)."""
+
+    async def get_record(self, key: StorageKey) -> tuple[Optional[str], Dict[str, Any]]:
+        """Состояние и данные за один round-trip."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.key_builder.build(key, "state"))
+            pipe.get(self.key_builder.build(key, "data"))
+            state, data = await pipe.execute()
+
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return state, self.json_loads(data) if data is not None else {}
+
+    async def set_record(self, key: StorageKey, state: Any = _UNCHANGED, data: Any = _UNCHANGED) -> None:
+        """Записывает изменившиеся части (state и/или data) за один round-trip."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if state is not _UNCHANGED:
+                state_key = self.key_builder.build(key, "state")
+                if state is None:
+                    pipe.delete(state_key)
+                else:
+                    pipe.set(state_key, _state_name(state), ex=self.state_ttl)
+            if data is not _UNCHANGED:
+                data_key = self.key_builder.build(key, "data")
+                if not data:
+                    pipe.delete(data_key)
+                else:
+                    pipe.set(data_key, self.json_dumps(data), ex=self.data_ttl)
+            self._on_write(pipe, key)
+            await pipe.execute()
+
+    def _on_write(self, pipe, key: StorageKey) -> None:
+        """Дополнительные команды в pipeline записи."""
+
+
+def _seconds(ttl: int | timedelta | None) -> Optional[float]:
+    return ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+
+
+class L1CachedRedisStorage(PipelinedRedisStorage):
+    """
+    PipelinedRedisStorage с локальным кешем записей FSM (LRU с TTL) перед Redis.
+
+    Чтения обслуживаются из памяти процесса, запись идет сквозь кеш в Redis и
+    сопровождается сообщением в канал инвалидации: другие реплики бота удаляют у себя
+    эту запись. Срок жизни записи в кеше не превышает оставшийся TTL ключей в Redis.
+
+    Кеш используется только пока есть подписка на канал: при ее потере кеш очищается,
+    а чтения идут в Redis до переподключения. Между записью на одной реплике и получением
+    инвалидации другой возможно короткое окно устаревших данных.
+    l1_maxsize=0 выключает кеш.
+    """
+
+    INVALIDATION_CHANNEL = "fsm:l1:invalidate"
+
+    def __init__(self, *args, l1_maxsize: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._instance_id = uuid.uuid4().hex
+        self._l1: Optional[TLRUCache] = (
+            TLRUCache(maxsize=l1_maxsize, ttu=lambda _key, record, _now: record[2]) if l1_maxsize > 0 else None
+        )
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._invalidations = 0     # Счетчик полученных инвалидаций: чтение, пересекшееся с ней, не кешируется
+        self.hits = 0
+        self.misses = 0
+
+    def _l1_key(self, key: StorageKey) -> str:
+        return self.key_builder.build(key)
+
+    def _expires_at(self, *ttls: Optional[float]) -> float:
+        """Срок жизни записи в кеше по TTL ключей в Redis (None - без срока)."""
+        ttls = [ttl for ttl in ttls if ttl is not None]
+        return time.monotonic() + min(ttls) if ttls else float("inf")
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen_invalidations())
+
+    async def _listen_invalidations(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                    self._subscribed = True
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        payload = message["data"]
+                        if isinstance(payload, bytes):
+                            payload = payload.decode("utf-8")
+                        instance_id, _, l1_key = payload.partition(" ")
+                        if instance_id != self._instance_id:
+                            self._invalidations += 1
+                            self._l1.pop(l1_key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"FSM L1 invalidation channel lost, cache cleared: {e}")
+            finally:
+                self._subscribed = False
+                self._l1.clear()
+            await asyncio.sleep(1)
+
+    async def get_record(self, key: StorageKey) -> tuple[Optional[str], Dict[str, Any]]:
+        if self._l1 is None:
+            return await super().get_record(key)
+
+        self._ensure_listener()
+        l1_key = self._l1_key(key)
+        record = self._l1.get(l1_key) if self._subscribed else None
+        if record is not None:
+            self.hits += 1
+            return record[0], copy.deepcopy(record[1])
+
+        self.misses += 1
+        invalidations = self._invalidations
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.key_builder.build(key, "state"))
+            pipe.get(self.key_builder.build(key, "data"))
+            pipe.pttl(self.key_builder.build(key, "state"))
+            pipe.pttl(self.key_builder.build(key, "data"))
+            state, data, state_pttl, data_pttl = await pipe.execute()
+
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        data = self.json_loads(data) if data is not None else {}
+
+        # pttl: -2 - ключа нет, -1 - ключ без срока. Для отсутствующего ключа - TTL будущей записи
+        ttls = [
+            pttl / 1000 if pttl >= 0 else None if pttl == -1 else _seconds(default_ttl)
+            for pttl, default_ttl in ((state_pttl, self.state_ttl), (data_pttl, self.data_ttl))
+        ]
+        if self._subscribed and invalidations == self._invalidations:
+            self._l1[l1_key] = (state, copy.deepcopy(data), self._expires_at(*ttls))
+        return state, data
+
+    async def set_record(self, key: StorageKey, state: Any = _UNCHANGED, data: Any = _UNCHANGED) -> None:
+        if self._l1 is None:
+            return await super().set_record(key, state=state, data=data)
+
+        l1_key = self._l1_key(key)
+        cached = self._l1.pop(l1_key, None)
+        await super().set_record(key, state=state, data=data)
+
+        if cached is None or not self._subscribed:
+            return
+        new_state = _state_name(state) if state is not _UNCHANGED else cached[0]
+        new_data = dict(data) if data is not _UNCHANGED else cached[1]
+        expires_at = min(
+            cached[2],
+            self._expires_at(_seconds(self.state_ttl)) if state is not _UNCHANGED else float("inf"),
+            self._expires_at(_seconds(self.data_ttl)) if data is not _UNCHANGED else float("inf"),
+        )
+        self._l1[l1_key] = (new_state, copy.deepcopy(new_data), expires_at)
+
+    def _on_write(self, pipe, key: StorageKey) -> None:
+        if self._l1 is not None:
+            pipe.publish(self.INVALIDATION_CHANNEL, f"{self._instance_id} {self._l1_key(key)}")
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        if self._l1 is None:
+            return await super().get_state(key)
+        return (await self.get_record(key))[0]
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        if self._l1 is None:
+            return await super().get_data(key)
+        return (await self.get_record(key))[1]
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        if self._l1 is None:
+            return await super().set_state(key, state)
+        await self.set_record(key, state=state)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if self._l1 is None:
+            return await super().set_data(key, data)
+        await self.set_record(key, data=data)
+
+    def stats_dict(self) -> dict:
+        return {
+            "l1_enabled": self._l1 is not None,
+            "l1_entries": len(self._l1) if self._l1 is not None else 0,
+            "l1_subscribed": self._subscribed,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await super().close()
+
+
+def create_events_isolation(storage: RedisStorage, kind: str = "local") -> BaseEventIsolation:
+    """
+    Блокировка апдейтов одного пользователя на время обработки. StateSession читает запись
+    в начале апдейта и пишет в конце, поэтому без блокировки параллельные апдейты
+    одного пользователя затирают изменения друг друга.
+    local - в пределах процесса, redis - между несколькими экземплярами бота.
+    """
+    if kind == "local":
+        return SimpleEventIsolation()
+    if kind == "redis":
+        return storage.create_isolation()
+    raise ValueError(f"Unknown FSM events isolation '{kind}', expected one of: local, redis")
+
+
+class StateSession(FSMContext):
+    """
+    FSMContext одного апдейта: состояние и данные загружаются из хранилища один раз
+    при первом обращении, изменения копятся в памяти и записываются одним flush в конце
+    обработки (см. middleware.StateSessionMiddleware). Неизмененные части не записываются.
+
+    Работает только под блокировкой events isolation (см. create_events_isolation).
+
+    После flush (или discard, если обработчик упал) сессия пишет изменения сразу,
+    как обычный FSMContext: так работают обработчики ошибок, вызываемые уже после основного обработчика.
+    """
+
+    def __init__(self, storage: BaseStorage, key: StorageKey):
+        super().__init__(storage, key)
+        self._loaded = False
+        self._buffered = True
+        self._state: Optional[str] = None
+        self._data: Dict[str, Any] = {}
+        self._stored_state: Optional[str] = None
+        self._stored_data: Dict[str, Any] = {}
+
+    async def _load(self) -> None:
+        if self._loaded:
+            return
+        if isinstance(self.storage, PipelinedRedisStorage):
+            state, data = await self.storage.get_record(self.key)
+        else:
+            state, data = await self.storage.get_state(self.key), await self.storage.get_data(self.key)
+        self._state, self._data = state, data
+        self._stored_state, self._stored_data = state, copy.deepcopy(data)
+        self._loaded = True
+
+    async def get_state(self) -> Optional[str]:
+        await self._load()
+        return self._state
+
+    async def set_state(self, state: StateType = None) -> None:
+        await self._load()
+        self._state = _state_name(state)
+        if not self._buffered:
+            await self.flush()
+
+    async def get_data(self) -> Dict[str, Any]:
+        await self._load()
+        return dict(self._data)
+
+    async def get_value(self, key: str, default: Optional[Any] = None) -> Optional[Any]:
+        await self._load()
+        return copy.copy(self._data.get(key, default))
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        await self._load()
+        self._data = dict(data)
+        if not self._buffered:
+            await self.flush()
+
+    async def update_data(self, data: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        await self._load()
+        if data:
+            kwargs.update(data)
+        self._data.update(kwargs)
+        if not self._buffered:
+            await self.flush()
+        return dict(self._data)
+
+    def discard(self) -> None:
+        """Отбрасывает несохраненные изменения. Последующие изменения пишутся сразу."""
+        self._buffered = False
+        self._state, self._data = self._stored_state, copy.deepcopy(self._stored_data)
+
+    async def flush(self) -> None:
+        """Записывает изменения с момента загрузки. Последующие изменения пишутся сразу."""
+        self._buffered = False
+        if not self._loaded:
+            return
+
+        state = self._state if self._state != self._stored_state else _UNCHANGED
+        data = self._data if self._data != self._stored_data else _UNCHANGED
+        if state is _UNCHANGED and data is _UNCHANGED:
+            return
+
+        if isinstance(self.storage, PipelinedRedisStorage):
+            await self.storage.set_record(self.key, state=state, data=data)
+        else:
+            if state is not _UNCHANGED:
+                await self.storage.set_state(self.key, state)
+            if data is not _UNCHANGED:
+                await self.storage.set_data(self.key, data)
+
+        if state is not _UNCHANGED:
+            self._stored_state = self._state
+        if data is not _UNCHANGED:
+            self._stored_data = copy.deepcopy(self._data)
@@ -24,6 +24,11 @@ class ActionStates(StatesGroup):
     waiting_sub_confirm = State()
 
 
+# Состояния, в которых ввод только кнопками: текстовое сообщение в них - поисковый запрос.
+# Шаги с вводом текста сюда не добавляются, иначе их сообщения перехватит поиск
+BUTTON_ONLY_STATES = (None, GroupStates, TeacherStates, ActionStates)
+
+
 async def get_state_data(
         state: FSMContext,
         required_keys: Iterable[str] = (),
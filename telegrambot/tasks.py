@@ -1,34 +1,71 @@
 import asyncio
 import logging
+import time
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from api_client.thunder_protection import SingleFlight
 from config import settings
 from dependencies import Deps
+from managers import KeyboardManager
 
 logger = logging.getLogger(__name__)
 
 
+async def refresh_directories(deps: Deps) -> None:
+    """Обновляет справочники групп и преподавателей из API (ошибки логируются)."""
+    results = await asyncio.gather(
+        deps.services.teacher().refresh(),
+        deps.services.group().refresh(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Directories refresh failed: {result}")
+    prebuild_keyboards(deps)
+    await deps.services.search().rebuild()
+
+
+def prebuild_keyboards(deps: Deps, schedule: bool = False) -> None:
+    """
+    Собирает клавиатуры справочников заранее, чтобы первое нажатие не платило за сборку.
+    Клавиатуры листания расписания не зависят от справочников, их достаточно собрать при старте (schedule).
+    """
+    if not settings.keyboards_prebuild:
+        return
+    started = time.perf_counter()
+    built = KeyboardManager.prebuild(deps.services.group().directory, deps.services.teacher().directory)
+    if schedule:
+        built += KeyboardManager.prebuild_schedule_keyboards()
+    logger.info(f"Prebuilt {built} keyboards in {(time.perf_counter() - started) * 1000:.1f} ms.")
+
+
 async def setup_periodic_task_scheduler(deps: Deps) -> AsyncIOScheduler:
     """Настройка и запуск планировщика"""
     scheduler = deps.scheduler()
 
     async def update_keyboards():
-        try:
-            await asyncio.gather(
-                deps.services.group().refresh(),
-                deps.services.teacher().refresh(),
-                return_exceptions=True
-            )
-            await deps.cache_service().update_all()
-        except Exception as e:
-            logger.error(f"Scheduled update failed: {e}")
-
-    # Обновление клавиатур с заданной периодичностью
+        await refresh_directories(deps)
+
+    async def log_client_stats():
+        api_client = deps.api_client()
+        logger.info(f"API connection pool: {api_client.pool_stats.as_dict()}")
+        logger.info(f"API caches: {api_client.cache_stats()}")
+        logger.info(f"Single-flight calls: {SingleFlight.stats()}")
+        logger.info(f"FSM storage: {deps.storage().stats_dict()}")
+
+    # Обновление клавиатур с заданной периодичностью (инкрементальное, без изменений - ответ 304)
     scheduler.add_job(
         update_keyboards,
         **settings.update_keyboards_rule,
-        id="daily_keyboard_update",
+        id="keyboard_update",
+    )
+
+    # Периодический вывод метрик API-клиента в лог
+    scheduler.add_job(
+        log_client_stats,
+        **settings.stats_log_rule,
+        id="client_stats_log",
     )
 
     scheduler.start()
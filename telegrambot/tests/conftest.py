@@ -0,0 +1,19 @@
+import os
+import sys
+from pathlib import Path
+
+# Модули бота импортируются от каталога telegrambot, как при запуске bot.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Обязательные настройки для модулей, читающих config при импорте
+for name, value in {
+    "API_BASE_URL": "http://localhost/api",
+    "HMAC_SECRET": "secret",
+    "BOT_SOCIAL_ID": "1",
+    "BOT_TOKEN": "123:test",
+    "REDIS_STORAGE_URL": "redis://localhost",
+    "STORAGE_STATE_TTL": "3600",
+    "STORAGE_DATA_TTL": "3600",
+    "BASE_SCRAPING_URL": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
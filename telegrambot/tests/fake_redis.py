@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+
+class InMemoryRedis:
+    """
+    Минимальная замена redis.asyncio.Redis для тестов и бенчмарков:
+    get/set/delete/pttl/publish в pipeline, pub/sub и задержка сети на каждый round-trip.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.values: dict[str, tuple[bytes, float]] = {}
+        self.channels: dict[str, list[asyncio.Queue]] = {}
+        self.round_trips = 0
+
+    def _get(self, key):
+        value, expires_at = self.values.get(key, (None, float("inf")))
+        return value if expires_at > time.monotonic() else None
+
+    def _pttl(self, key):
+        if self._get(key) is None:
+            return -2
+        expires_at = self.values[key][1]
+        return -1 if expires_at == float("inf") else int((expires_at - time.monotonic()) * 1000)
+
+    def _set(self, key, value, ex=None):
+        value = value.encode() if isinstance(value, str) else value
+        self.values[key] = (value, time.monotonic() + ex if ex else float("inf"))
+
+    def _delete(self, key):
+        self.values.pop(key, None)
+
+    def _publish(self, channel, message):
+        for queue in self.channels.get(channel, ()):
+            queue.put_nowait({"type": "message", "data": message.encode()})
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self._get(key)
+
+    async def set(self, key, value, ex=None):
+        await self._round_trip()
+        self._set(key, value, ex=ex)
+
+    async def delete(self, key):
+        await self._round_trip()
+        self._delete(key)
+
+    def pipeline(self, transaction=True):
+        redis, commands = self, []
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: commands.append((name, args, kwargs))
+
+            async def execute(self):
+                await redis._round_trip()
+                return [getattr(redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in commands]
+
+        return Pipeline()
+
+    def pubsub(self):
+        redis, queue = self, asyncio.Queue()
+
+        class PubSub:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def subscribe(self, channel):
+                redis.channels.setdefault(channel, []).append(queue)
+
+            async def listen(self):
+                while True:
+                    yield await queue.get()
+
+        return PubSub()
+
+    async def aclose(self, close_connection_pool=True):
+        pass
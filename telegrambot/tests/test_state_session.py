@@ -0,0 +1,113 @@
+import asyncio
+
+from aiogram.fsm.storage.base import StorageKey
+
+from state_session import L1CachedRedisStorage, PipelinedRedisStorage
+from tests.fake_redis import InMemoryRedis
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+STATE = "GroupStates:choosing_grade"
+
+
+def l1_storage(redis: InMemoryRedis) -> L1CachedRedisStorage:
+    return L1CachedRedisStorage(redis=redis, state_ttl=3600, data_ttl=3600, l1_maxsize=100)
+
+
+async def subscribe(*replicas: L1CachedRedisStorage) -> None:
+    """Первое чтение запускает подписку на канал инвалидации, дожидаемся ее."""
+    for replica in replicas:
+        await replica.get_record(KEY)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert all(replica.stats_dict()["l1_subscribed"] for replica in replicas)
+
+
+def test_record_is_read_and_written_in_one_round_trip():
+    async def main():
+        redis = InMemoryRedis()
+        storage = PipelinedRedisStorage(redis=redis, state_ttl=3600, data_ttl=3600)
+
+        await storage.set_record(KEY, state=STATE, data={"faculty_id": 3})
+        assert redis.round_trips == 1
+
+        assert await storage.get_record(KEY) == (STATE, {"faculty_id": 3})
+        assert redis.round_trips == 2
+
+    asyncio.run(main())
+
+
+def test_empty_record_parts_are_deleted():
+    async def main():
+        redis = InMemoryRedis()
+        storage = PipelinedRedisStorage(redis=redis, state_ttl=3600, data_ttl=3600)
+        await storage.set_record(KEY, state=STATE, data={"faculty_id": 3})
+        assert len(redis.values) == 2
+
+        await storage.set_record(KEY, data={})
+        assert await storage.get_record(KEY) == (STATE, {})
+        assert len(redis.values) == 1
+
+        await storage.set_record(KEY, state=None)
+        assert await storage.get_record(KEY) == (None, {})
+        assert redis.values == {}
+
+    asyncio.run(main())
+
+
+def test_l1_serves_repeated_reads_without_redis():
+    async def main():
+        redis = InMemoryRedis()
+        storage = l1_storage(redis)
+        await storage.set_record(KEY, state=STATE, data={"faculty_id": 3})
+        await subscribe(storage)
+
+        await storage.get_record(KEY)
+        round_trips = redis.round_trips
+        state, data = await storage.get_record(KEY)
+        data["faculty_id"] = 4  # изменение копии не портит кеш
+
+        assert redis.round_trips == round_trips
+        assert await storage.get_record(KEY) == (STATE, {"faculty_id": 3})
+        assert storage.hits == 2
+        await storage.close()
+
+    asyncio.run(main())
+
+
+def test_own_write_updates_l1():
+    async def main():
+        redis = InMemoryRedis()
+        storage = l1_storage(redis)
+        await storage.set_record(KEY, state=STATE, data={"faculty_id": 3})
+        await subscribe(storage)
+        await storage.get_record(KEY)
+
+        await storage.set_record(KEY, data={"faculty_id": 4})
+        round_trips = redis.round_trips
+        assert await storage.get_record(KEY) == (STATE, {"faculty_id": 4})
+        assert redis.round_trips == round_trips
+        await storage.close()
+
+    asyncio.run(main())
+
+
+def test_write_on_another_replica_invalidates_l1():
+    async def main():
+        redis = InMemoryRedis()
+        replica_a, replica_b = l1_storage(redis), l1_storage(redis)
+        await replica_a.set_record(KEY, state=STATE, data={"faculty_id": 3})
+        await subscribe(replica_a, replica_b)
+        assert await replica_a.get_record(KEY) == (STATE, {"faculty_id": 3})
+        assert replica_a.stats_dict()["l1_entries"] == 1
+
+        await replica_b.set_record(KEY, data={"faculty_id": 4})
+        await asyncio.sleep(0)
+
+        assert replica_a.stats_dict()["l1_entries"] == 0
+        misses = replica_a.misses
+        assert await replica_a.get_record(KEY) == (STATE, {"faculty_id": 4})
+        assert replica_a.misses == misses + 1
+        for replica in (replica_a, replica_b):
+            await replica.close()
+
+    asyncio.run(main())